@@ -0,0 +1,32 @@
+import argparse
+
+from .core.cache import Cache
+
+def main():
+    parser = argparse.ArgumentParser(prog="iatool", description="A quantitative investment analysis tool.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    cache_parser = subparsers.add_parser("cache", help="Manage the local data cache")
+    cache_subparsers = cache_parser.add_subparsers(dest="cache_command", required=True)
+
+    cache_subparsers.add_parser("compact", help="Remove expired entries and orphaned files")
+    cache_subparsers.add_parser("stats", help="Show cache usage")
+
+    evict_parser = cache_subparsers.add_parser("evict", help="Evict entries until the cache fits in a size")
+    evict_parser.add_argument("size_mb", type=float, help="Target cache size in megabytes")
+
+    args = parser.parse_args()
+
+    cache = Cache()
+
+    if args.cache_command == "compact":
+        cache.compact()
+    elif args.cache_command == "stats":
+        for key, value in cache.stats.items():
+            print(f"{key}: {value}")
+    elif args.cache_command == "evict":
+        reclaimed = cache.evict(int(args.size_mb * 1024 ** 2))
+        print(f"Evicted cache entries: reclaimed {reclaimed} bytes")
+
+if __name__ == "__main__":
+    main()
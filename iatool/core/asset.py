@@ -1,4 +1,5 @@
-from typing import Self
+import asyncio
+from typing import Dict, List, Optional, Self
 
 import aiohttp
 
@@ -8,13 +9,36 @@ from .data import IncomeStatementData
 from .data import BalanceSheetData
 from .data import CashFlowData
 
+from .config import get_config_value
+from .error import ComponentError
+from .error import ComponentNotLoadedError
 from .error import InputError
 from .util import get_date_range
 
 class Asset:
-    def __init__(self, session: aiohttp.ClientSession, ticker: str):
+    _components = {
+        "profile": lambda asset: CompanyProfileData.create(asset.session, asset.ticker),
+        "historical_prices": lambda asset: HistoricalPricesData.create(asset.session, asset.ticker, asset.start_date),
+        "income_statement_quarter": lambda asset: IncomeStatementData.create(asset.session, asset.ticker, "quarter"),
+        "balance_sheet_quarter": lambda asset: BalanceSheetData.create(asset.session, asset.ticker, "quarter"),
+        "cash_flow_quarter": lambda asset: CashFlowData.create(asset.session, asset.ticker, "quarter"),
+        "income_statement_annual": lambda asset: IncomeStatementData.create(asset.session, asset.ticker, "annual"),
+        "balance_sheet_annual": lambda asset: BalanceSheetData.create(asset.session, asset.ticker, "annual"),
+        "cash_flow_annual": lambda asset: CashFlowData.create(asset.session, asset.ticker, "annual"),
+    }
+
+    def __init__(
+        self,
+        session: aiohttp.ClientSession,
+        ticker: str,
+        concurrency: Optional[int] = None,
+        start_date: str = "1990-01-01",
+    ):
         self._session = session
         self._ticker = ticker
+        self._start_date = start_date
+        self._concurrency = concurrency or get_config_value("asset.concurrency", len(self._components))
+        self._errors: Dict[str, ComponentError] = {}
 
         self._profile = None
 
@@ -35,53 +59,178 @@ class Asset:
     @property
     def ticker(self) -> str:
         return self._ticker
-    
-    @classmethod
-    async def create(cls, session: aiohttp.ClientSession, ticker: str) -> Self:
-        self = cls(session, ticker)
-        
-        self._profile = await CompanyProfileData.create(session, ticker)
 
-        self._historical_prices = await HistoricalPricesData.create(session, ticker)
+    @property
+    def start_date(self) -> str:
+        return self._start_date
+
+    @property
+    def errors(self) -> Dict[str, ComponentError]:
+        return self._errors
+
+    @property
+    def loaded(self) -> List[str]:
+        return [name for name in self._components if getattr(self, f"_{name}") is not None]
 
-        self._income_statement_quarter = await IncomeStatementData.create(session, ticker, "quarter")
-        self._balance_sheet_quarter = await BalanceSheetData.create(session, ticker, "quarter")
-        self._cash_flow_quarter = await CashFlowData.create(session, ticker, "quarter")
+    def __getstate__(self) -> dict:
+        # Assets are sent to worker processes with their frames but without the HTTP session
+        state = self.__dict__.copy()
+        state["_session"] = None
 
-        self._income_statement_annual = await IncomeStatementData.create(session, ticker, "annual")
-        self._balance_sheet_annual = await BalanceSheetData.create(session, ticker, "annual")
-        self._cash_flow_annual = await CashFlowData.create(session, ticker, "annual")
+        return state
+
+    @classmethod
+    async def create(
+        cls,
+        session: aiohttp.ClientSession,
+        ticker: str,
+        concurrency: Optional[int] = None,
+        profile: Optional[CompanyProfileData] = None,
+        lazy: bool = False,
+        start_date: str = "1990-01-01",
+    ) -> Self:
+        self = cls(session, ticker, concurrency, start_date)
+        self._profile = profile
+
+        if not lazy:
+            await self.load()
 
         return self
-    
+
+    async def load(self, *names: str):
+        names = names or tuple(self._components)
+
+        for name in names:
+            if name not in self._components:
+                raise InputError(f"Invalid component '{name}'")
+
+        semaphore = asyncio.Semaphore(self._concurrency)
+        missing = [name for name in names if getattr(self, f"_{name}") is None]
+
+        await asyncio.gather(*(self._create_component(semaphore, name) for name in missing))
+
+    def attach(self, name: str, component):
+        if name not in self._components:
+            raise InputError(f"Invalid component '{name}'")
+
+        setattr(self, f"_{name}", component)
+        self._errors.pop(name, None)
+
+    def release(self, *names: str):
+        for name in names or tuple(self._components):
+            if name not in self._components:
+                raise InputError(f"Invalid component '{name}'")
+
+            setattr(self, f"_{name}", None)
+
     async def update(self):
-        self._profile.update()
+        semaphore = asyncio.Semaphore(self._concurrency)
+
+        names = [name for name in self._components if getattr(self, f"_{name}") is not None or name in self._errors]
+
+        await asyncio.gather(*(self._update_component(semaphore, name) for name in names))
+
+    async def _create_component(self, semaphore: asyncio.Semaphore, name: str):
+        async with semaphore:
+            try:
+                component = await self._components[name](self)
+            except Exception as error:
+                self._set_error(name, error)
+                return
+
+        setattr(self, f"_{name}", component)
+        self._errors.pop(name, None)
+
+    async def _update_component(self, semaphore: asyncio.Semaphore, name: str):
+        component = getattr(self, f"_{name}")
+
+        if component is None:
+            await self._create_component(semaphore, name)
+            return
 
-        self._historical_prices.update()
-        
-        self._income_statement_quarter.update()
-        self._balance_sheet_quarter.update()
-        self._cash_flow_quarter.update()
+        async with semaphore:
+            try:
+                await component.update()
+            except Exception as error:
+                self._set_error(name, error)
+                return
 
-        self._income_statement_annual.update()
-        self._balance_sheet_annual.update()
-        self._cash_flow_annual.update()
+        self._errors.pop(name, None)
+
+    def _set_error(self, name: str, error: Exception):
+        self._errors[name] = ComponentError(name, f"Failed to load for {self._ticker}: {error}")
+
+        print(self._errors[name])
+
+    def _get_component(self, name: str):
+        component = getattr(self, f"_{name}")
+
+        if component is None:
+            if name in self._errors:
+                raise self._errors[name]
+
+            raise ComponentNotLoadedError(name, self._ticker)
+
+        return component
+
+    def get_component(self, name: str):
+        if name not in self._components:
+            raise InputError(f"Invalid component '{name}'")
+
+        return self._get_component(name)
+
+    def _get_period_component(self, statement: str, period: str) -> str:
+        if period not in ("quarter", "annual"):
+            raise InputError("Invalid period")
+
+        return f"{statement}_{period}"
+
+    async def _load_and_get(self, name: str, getter, *args, release: bool = False):
+        await self.load(name)
+
+        data = getter(*args)
+
+        if release:
+            self.release(name)
+
+        return data
+
+    async def load_profile(self, release: bool = False):
+        return await self._load_and_get("profile", self.get_profile, release=release)
+
+    async def load_historical_prices(self, start_date: str, end_date: str, release: bool = False):
+        return await self._load_and_get("historical_prices", self.get_historical_prices, start_date, end_date, release=release)
+
+    async def load_income_statement(self, start_date: str, end_date: str, period: str, release: bool = False):
+        name = self._get_period_component("income_statement", period)
+
+        return await self._load_and_get(name, self.get_income_statement, start_date, end_date, period, release=release)
+
+    async def load_balance_sheet(self, start_date: str, end_date: str, period: str, release: bool = False):
+        name = self._get_period_component("balance_sheet", period)
+
+        return await self._load_and_get(name, self.get_balance_sheet, start_date, end_date, period, release=release)
+
+    async def load_cash_flow(self, start_date: str, end_date: str, period: str, release: bool = False):
+        name = self._get_period_component("cash_flow", period)
+
+        return await self._load_and_get(name, self.get_cash_flow, start_date, end_date, period, release=release)
 
     def get_profile(self):
-        return self._profile.data
-    
+        return self._get_component("profile").data
+
     def get_historical_prices(self, start_date: str, end_date: str):
-        filtered_data = get_date_range(self._historical_prices.data, start_date, end_date)
+        filtered_data = get_date_range(self._get_component("historical_prices").data, start_date, end_date)
 
         return filtered_data
 
     def get_income_statement(self, start_date: str, end_date: str, period: str):
         if period == "quarter":
-            filtered_data = get_date_range(self._income_statement_quarter.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("income_statement_quarter").data, start_date, end_date)
 
             return filtered_data
         elif period == "annual":
-            filtered_data = get_date_range(self._income_statement_annual.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("income_statement_annual").data, start_date, end_date)
 
             return filtered_data
         else:
@@ -89,23 +238,23 @@ class Asset:
 
     def get_balance_sheet(self, start_date: str, end_date: str, period: str):
         if period == "quarter":
-            filtered_data = get_date_range(self._balance_sheet_quarter.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("balance_sheet_quarter").data, start_date, end_date)
 
             return filtered_data
         elif period == "annual":
-            filtered_data = get_date_range(self._balance_sheet_annual.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("balance_sheet_annual").data, start_date, end_date)
 
             return filtered_data
         else:
             raise InputError("Invalid period")
-        
+
     def get_cash_flow(self, start_date: str, end_date: str, period: str):
         if period == "quarter":
-            filtered_data = get_date_range(self._cash_flow_quarter.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("cash_flow_quarter").data, start_date, end_date)
 
             return filtered_data
         elif period == "annual":
-            filtered_data = get_date_range(self._cash_flow_annual.data, start_date, end_date)
+            filtered_data = get_date_range(self._get_component("cash_flow_annual").data, start_date, end_date)
 
             return filtered_data
         else:
@@ -1,8 +1,17 @@
 import os
 import json
-from datetime import datetime
-from typing import Optional, Union
+import time
+import atexit
+import sqlite3
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Set, Tuple, Union
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from .config import get_config_value
+from .util import get_memory_usage
 
 class Cache:
     _instance: Optional["Cache"] = None
@@ -13,55 +22,337 @@ class Cache:
             cls._instance = super().__new__(cls)
             cls._dirname = os.path.abspath(dirname)
             os.makedirs(cls._dirname, exist_ok=True)
+
+            cls._instance._open_catalog()
+            atexit.register(cls._instance.flush)
         return cls._instance
 
-    def get(self, filepath: str) -> Optional[Union[pd.Series, pd.DataFrame]]:
-        final_path = os.path.join(self._dirname, filepath)
+    def _open_catalog(self):
+        self._catalog_path = os.path.join(self._dirname, "catalog.sqlite")
+        self._connection = sqlite3.connect(self._catalog_path)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "filepath TEXT PRIMARY KEY, expiry TEXT NOT NULL, "
+            "size INTEGER NOT NULL DEFAULT 0, accessed REAL NOT NULL DEFAULT 0)"
+        )
+
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(entries)")}
+        if "size" not in columns:
+            self._connection.execute("ALTER TABLE entries ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+        if "accessed" not in columns:
+            self._connection.execute("ALTER TABLE entries ADD COLUMN accessed REAL NOT NULL DEFAULT 0")
+
+        self._connection.commit()
+
+        self._expiries: Dict[str, datetime] = {}
+        self._sizes: Dict[str, int] = {}
+        self._accessed: Dict[str, float] = {}
+        self._pending: Dict[str, None] = {}
+        self._deleted: Set[str] = set()
+        self._flush_size = get_config_value("cache.flush_size", 100)
+
+        self._disk_bytes = 0
+        self._disk_quota = get_config_value("cache.disk_quota_mb", None)
+        self._disk_quota = self._disk_quota * 1024 ** 2 if self._disk_quota is not None else None
+
+        self._memory: OrderedDict[str, Tuple[Union[pd.Series, pd.DataFrame], int]] = OrderedDict()
+        self._memory_bytes = 0
+        self._memory_limit = get_config_value("cache.memory_limit_mb", 512) * 1024 ** 2
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "promotions": 0, "evictions": 0, "disk_evictions": 0}
+
+        for filepath, expiry, size, accessed in self._connection.execute("SELECT filepath, expiry, size, accessed FROM entries"):
+            self._expiries[filepath] = datetime.strptime(expiry, "%Y-%m-%d")
+            self._accessed[filepath] = accessed
+
+            # Entries written before sizes were tracked are measured once
+            if not size:
+                size = self._file_size(filepath)
+                self._pending[filepath] = None
+
+            self._sizes[filepath] = size
+            self._disk_bytes += size
+
+        self._import_metadata()
+
+    def _import_metadata(self):
         meta_path = os.path.join(self._dirname, "metadata.json")
 
         try:
             with open(meta_path, "r") as file:
                 metadata = json.load(file)
         except (FileNotFoundError, json.JSONDecodeError):
-            return None
+            return
+
+        for filepath, expiry in metadata.get("expiries", {}).items():
+            if filepath not in self._expiries:
+                self._expiries[filepath] = datetime.strptime(expiry, "%Y-%m-%d")
+                self._sizes[filepath] = self._file_size(filepath)
+                self._accessed[filepath] = 0.0
+                self._disk_bytes += self._sizes[filepath]
+                self._pending[filepath] = None
+
+        self.flush()
+        os.replace(meta_path, f"{meta_path}.bak")
+
+    def flush(self):
+        if not self._pending and not self._deleted:
+            return
+
+        with self._connection:
+            self._connection.executemany(
+                "DELETE FROM entries WHERE filepath = ?",
+                [(filepath,) for filepath in self._deleted],
+            )
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO entries (filepath, expiry, size, accessed) VALUES (?, ?, ?, ?)",
+                [
+                    (filepath, self._expiries[filepath].strftime("%Y-%m-%d"), self._sizes[filepath], self._accessed[filepath])
+                    for filepath in self._pending
+                ],
+            )
+
+        self._pending.clear()
+        self._deleted.clear()
+
+    def _record(self, filepath: str):
+        self._pending[filepath] = None
+
+        if len(self._pending) >= self._flush_size:
+            self.flush()
+
+    def _file_size(self, filepath: str) -> int:
+        try:
+            return os.path.getsize(os.path.join(self._dirname, filepath))
+        except FileNotFoundError:
+            return 0
+
+    def expiry(self, filepath: str) -> Optional[datetime]:
+        return self._expiries.get(filepath)
+
+    @property
+    def dirname(self) -> str:
+        return self._dirname
+
+    @property
+    def disk_bytes(self) -> int:
+        return self._disk_bytes
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            **self._stats,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._expiries),
+            "disk_bytes": self._disk_bytes,
+        }
+
+    def _promote(self, filepath: str, data: Union[pd.Series, pd.DataFrame]):
+        self.invalidate(filepath)
+
+        size = get_memory_usage(data)
+
+        if size > self._memory_limit:
+            return
+
+        self._memory[filepath] = (data, size)
+        self._memory_bytes += size
+        self._stats["promotions"] += 1
+
+        while self._memory_bytes > self._memory_limit:
+            _, (_, evicted_size) = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted_size
+            self._stats["evictions"] += 1
 
-        expiry = metadata.get("expiries", {}).get(filepath)
-        if expiry is None:
+    def invalidate(self, filepath: str):
+        entry = self._memory.pop(filepath, None)
+
+        if entry is not None:
+            self._memory_bytes -= entry[1]
+
+    def get(self, filepath: str, allow_expired: bool = False) -> Optional[Union[pd.Series, pd.DataFrame]]:
+        final_path = os.path.join(self._dirname, filepath)
+
+        expiry_date = self._expiries.get(filepath)
+        if expiry_date is None:
+            self._stats["misses"] += 1
             return None
 
-        expiry_date = datetime.strptime(expiry, "%Y-%m-%d")
-        if datetime.now() > expiry_date:
+        if not allow_expired and datetime.now() > expiry_date:
+            self._stats["misses"] += 1
             return None
 
+        self._accessed[filepath] = time.time()
+        self._record(filepath)
+
+        entry = self._memory.get(filepath)
+        if entry is not None:
+            self._memory.move_to_end(filepath)
+            self._stats["memory_hits"] += 1
+            return entry[0]
+
         try:
             print(f"Retrieving data from cache: {final_path}")
-            return pd.read_feather(final_path)
+            data = self._read(final_path)
         except FileNotFoundError:
+            self._stats["misses"] += 1
             return None
+        except (pa.ArrowException, json.JSONDecodeError) as e:
+            print(f"Error while reading data: {e}")
+            self._stats["misses"] += 1
+            return None
+
+        self._stats["disk_hits"] += 1
+        self._promote(filepath, data)
+
+        return data
 
     def set(self, filepath: str, data: Union[pd.Series, pd.DataFrame], expiry: datetime):
         final_path = os.path.join(self._dirname, filepath)
         directory = os.path.dirname(final_path)
-        meta_path = os.path.join(self._dirname, "metadata.json")
 
         os.makedirs(directory, exist_ok=True)
 
-        expiry_str = expiry.strftime("%Y-%m-%d")
+        self.invalidate(filepath)
 
         try:
-            with open(meta_path, "r") as file:
-                metadata = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            metadata = {"expiries": {}}
+            self._write(final_path, data)
+        except Exception as e:
+            print(f"Error while saving data: {e}")
+            return
 
-        metadata["expiries"][filepath] = expiry_str
-        with open(meta_path, "w") as file:
-            json.dump(metadata, file, indent=4)
+        self._promote(filepath, data)
 
-        if isinstance(data, pd.Series):
-            data = data.to_frame(name="Value")
+        size = self._file_size(filepath)
+
+        self._disk_bytes += size - self._sizes.get(filepath, 0)
+        self._expiries[filepath] = datetime.strptime(expiry.strftime("%Y-%m-%d"), "%Y-%m-%d")
+        self._sizes[filepath] = size
+        self._accessed[filepath] = time.time()
+        self._deleted.discard(filepath)
+        self._record(filepath)
+
+        if self._disk_quota is not None and self._disk_bytes > self._disk_quota:
+            self.evict(int(self._disk_quota * 0.9), keep=filepath)
+
+    def delete(self, filepath: str) -> int:
+        self.invalidate(filepath)
+
+        size = self._file_size(filepath)
 
         try:
-            data.to_feather(final_path)
-        except Exception as e:
-            print(f"Error while saving data: {e}")
+            os.remove(os.path.join(self._dirname, filepath))
+        except FileNotFoundError:
+            pass
+
+        if filepath in self._expiries:
+            self._disk_bytes -= self._sizes.pop(filepath)
+            del self._expiries[filepath]
+            del self._accessed[filepath]
+
+        self._pending.pop(filepath, None)
+        self._deleted.add(filepath)
+
+        return size
+
+    def evict(self, target_bytes: int, keep: Optional[str] = None) -> int:
+        now = datetime.now()
+
+        expired = sorted(
+            (filepath for filepath, expiry in self._expiries.items() if expiry < now and filepath != keep),
+            key=self._expiries.get,
+        )
+        live = sorted(
+            (filepath for filepath, expiry in self._expiries.items() if expiry >= now and filepath != keep),
+            key=self._accessed.get,
+        )
+
+        reclaimed = 0
+
+        for filepath in expired + live:
+            if self._disk_bytes <= target_bytes:
+                break
+
+            reclaimed += self.delete(filepath)
+            self._stats["disk_evictions"] += 1
+
+        self.flush()
+
+        return reclaimed
+
+    def compact(self) -> int:
+        reclaimed = 0
+
+        retention = timedelta(days=get_config_value("cache.expired_retention_days", 30))
+        cutoff = datetime.now() - retention
+
+        for filepath in [filepath for filepath, expiry in self._expiries.items() if expiry < cutoff]:
+            reclaimed += self.delete(filepath)
+
+        for filepath in [filepath for filepath in self._expiries if not os.path.exists(os.path.join(self._dirname, filepath))]:
+            self.delete(filepath)
+
+        # Only files the cache itself writes are treated as orphans
+        for root, _, files in os.walk(self._dirname, topdown=False):
+            for name in files:
+                path = os.path.join(root, name)
+                filepath = os.path.relpath(path, self._dirname).replace(os.sep, "/")
+
+                if filepath in self._expiries or not name.endswith((".parquet", ".feather", ".tmp")):
+                    continue
+
+                reclaimed += os.path.getsize(path)
+                os.remove(path)
+
+            if root != self._dirname and not os.listdir(root):
+                os.rmdir(root)
+
+        self.flush()
+        self._connection.execute("VACUUM")
+
+        print(f"Compacted cache: reclaimed {reclaimed} bytes, {len(self._expiries)} entries and {self._disk_bytes} bytes remain")
+
+        return reclaimed
+
+    def _write(self, final_path: str, data: Union[pd.Series, pd.DataFrame]):
+        if isinstance(data, pd.Series):
+            metadata = {"kind": "series", "name": data.name}
+
+            try:
+                table = pa.Table.from_pandas(data.to_frame(name="value"))
+                metadata["layout"] = "column"
+            except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+                # Mixed-type series such as company profiles are stored as a single row
+                table = pa.Table.from_pandas(data.to_frame(name=0).T.infer_objects(), preserve_index=False)
+                metadata["layout"] = "row"
+        else:
+            metadata = {"kind": "frame"}
+            table = pa.Table.from_pandas(data)
+
+        schema_metadata = dict(table.schema.metadata or {})
+        schema_metadata[b"iatool"] = json.dumps(metadata).encode()
+        table = table.replace_schema_metadata(schema_metadata)
+
+        compression = get_config_value("cache.compression", "zstd")
+        compression = None if compression == "none" else compression
+
+        temp_path = f"{final_path}.tmp"
+        pq.write_table(table, temp_path, compression=compression)
+        os.replace(temp_path, final_path)
+
+    def _read(self, final_path: str) -> Union[pd.Series, pd.DataFrame]:
+        table = pq.read_table(final_path)
+        metadata = json.loads((table.schema.metadata or {}).get(b"iatool", b'{"kind": "frame"}'))
+
+        data = table.to_pandas()
+
+        if metadata["kind"] == "series":
+            if metadata["layout"] == "row":
+                data = data.iloc[0]
+            else:
+                data = data["value"]
+
+            data.name = metadata["name"]
+
+        return data
@@ -30,4 +30,15 @@ class ConfigSection:
             else:
                 setattr(self, key, value)
 
+def get_config_value(path: str, default: Any = None) -> Any:
+    node = Config()
+
+    for key in path.split("."):
+        node = getattr(node, key, None)
+
+        if node is None:
+            return default
+
+    return node
+
 _ = Config()
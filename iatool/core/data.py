@@ -1,20 +1,25 @@
 import os
 from abc import abstractmethod
-from typing import Self, Union
+from typing import Dict, List, Self, Union
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 
 import aiohttp
+import numpy as np
 import pandas as pd
 
 from .cache import Cache
+from .config import get_config_value
+from .util import sort_date_index
 
 from ..data.fmp import fmp_fetch_company_profile
+from ..data.fmp import fmp_fetch_company_profiles
 from ..data.fmp import fmp_fetch_income_statement
 from ..data.fmp import fmp_fetch_balance_sheet
 from ..data.fmp import fmp_fetch_cash_flow
 from ..data.fmp import fmp_fetch_all_tickers_exchange
 from ..data.fmp import fmp_fetch_historical_prices
+from ..data.fmp import fmp_compact
 
 class Data:
     _cache = Cache()
@@ -22,6 +27,7 @@ class Data:
     def __init__(self, session: aiohttp.ClientSession):
         self._session = session
         self._data = None
+        self._version = 0
     
     @property
     def data(self) -> Union[list, dict, pd.Series, pd.DataFrame]:
@@ -30,6 +36,10 @@ class Data:
 
         return self._data
     
+    @property
+    def version(self) -> int:
+        return self._version
+
     @property
     def session(self) -> aiohttp.ClientSession:
         if self._session is None:
@@ -37,6 +47,13 @@ class Data:
 
         return self._session
 
+    def __getstate__(self) -> dict:
+        # The HTTP session is bound to the event loop of this process and is never pickled
+        state = self.__dict__.copy()
+        state["_session"] = None
+
+        return state
+
     @classmethod
     @abstractmethod
     async def create(cls, session: aiohttp.ClientSession) -> Self:
@@ -57,21 +74,24 @@ class AllTickersExchangeData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, exchange: str) -> Self:
-        cached_data = cls._cache.get(f"all_tickers_data/{exchange}.feather")
-
-        if cached_data is not None:
-            return cached_data
+        cached_data = cls._cache.get(f"all_tickers_data/{exchange}.parquet")
 
         data = cls(session, exchange)
-        await data.update()
+
+        if cached_data is not None:
+            data._data = cached_data
+        else:
+            await data.update()
 
         return data
     
     async def update(self):
         self._data = await fmp_fetch_all_tickers_exchange(self._session, self._exchange)
 
+        self._version += 1
+
         expiry = datetime.now() + relativedelta(months=6)
-        self._cache.set(f"all_tickers_data/{self._exchange}.feather", self._data, expiry)
+        self._cache.set(f"all_tickers_data/{self._exchange}.parquet", self._data, expiry)
 
 class CompanyProfileData(Data):
     def __init__(self, session: aiohttp.ClientSession, ticker: str):
@@ -84,7 +104,7 @@ class CompanyProfileData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, ticker: str) -> Self:
-        cached_data = cls._cache.get(f"profile_data/{ticker}.feather")
+        cached_data = cls._cache.get(f"profile_data/{ticker}.parquet")
 
         data = cls(session, ticker)
 
@@ -94,12 +114,41 @@ class CompanyProfileData(Data):
             await data.update()
 
         return data
+
+    @classmethod
+    async def create_many(cls, session: aiohttp.ClientSession, tickers: List[str]) -> Dict[str, Self]:
+        profiles = {}
+        missing = []
+
+        for ticker in tickers:
+            cached_data = cls._cache.get(f"profile_data/{ticker}.parquet")
+
+            if cached_data is not None:
+                data = cls(session, ticker)
+                data._data = cached_data
+                profiles[ticker] = data
+            else:
+                missing.append(ticker)
+
+        if missing:
+            fetched_data = await fmp_fetch_company_profiles(session, missing)
+            expiry = datetime.now() + relativedelta(months=6)
+
+            for ticker, profile in fetched_data.items():
+                data = cls(session, ticker)
+                data._data = profile
+                cls._cache.set(f"profile_data/{ticker}.parquet", profile, expiry)
+                profiles[ticker] = data
+
+        return profiles
     
     async def update(self):
         self._data = await fmp_fetch_company_profile(self._session, self._ticker)
 
+        self._version += 1
+
         expiry = datetime.now() + relativedelta(months=6)
-        self._cache.set(f"profile_data/{self._ticker}.feather", self._data, expiry)
+        self._cache.set(f"profile_data/{self._ticker}.parquet", self._data, expiry)
 
 class HistoricalPricesData(Data):
     def __init__(self, session: aiohttp.ClientSession, ticker: str, start_date: str = "1990-01-01"):
@@ -117,22 +166,75 @@ class HistoricalPricesData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, ticker: str, start_date: str = "1990-01-01") -> Self:
-        cache_key = f"historical_prices/{ticker}_{start_date}.feather"
+        cache_key = f"historical_prices/{ticker}_{start_date}.parquet"
         cached_data = cls._cache.get(cache_key)
 
         data = cls(session, ticker, start_date)
         if cached_data is not None:
-            data._data = cached_data
+            # Frames cached in the old descending order are normalised once here rather than on every slice
+            data._data = sort_date_index(cached_data)
         else:
+            expired_data = cls._cache.get(cache_key, allow_expired=True)
+            data._data = sort_date_index(expired_data) if expired_data is not None else None
             await data.update()
 
         return data
     
+    def _is_restated(self, new_data: pd.DataFrame) -> bool:
+        if not {"close", "adj_close"} <= set(self._data.columns) or not {"close", "adj_close"} <= set(new_data.columns):
+            return True
+
+        dates = self._data.index.intersection(new_data.index)
+
+        if dates.empty:
+            return True
+
+        # A dividend or split rescales adj_close over the whole history, which shows up as a new adjustment factor
+        cached = self._data.loc[dates]
+        fetched = new_data.loc[dates]
+
+        cached_factor = (cached["adj_close"] / cached["close"]).to_numpy(dtype="float64")
+        fetched_factor = (fetched["adj_close"] / fetched["close"]).to_numpy(dtype="float64")
+
+        rtol = get_config_value("data.price_restatement_rtol", 1e-4)
+
+        return not np.allclose(fetched_factor, cached_factor, rtol=rtol, atol=0, equal_nan=True)
+
+    def _merge(self, new_data: pd.DataFrame) -> pd.DataFrame:
+        start = new_data.index.min()
+        merged = pd.concat([self._data[self._data.index < start], new_data])
+
+        # change_over_time is relative to the first requested bar, so the new bars are re-based onto the cached history
+        if "change_over_time" in merged.columns and start in self._data.index:
+            base = 1 + float(self._data.loc[start, "change_over_time"])
+            rebased = (1 + new_data["change_over_time"].astype("float64")) * base - 1
+
+            merged["change_over_time"] = merged["change_over_time"].astype("float64")
+            merged.loc[new_data.index, "change_over_time"] = rebased
+
+        # Categories and float widths chosen for each frame can differ, so the merged frame is compacted again
+        return fmp_compact(sort_date_index(merged), f"merged historical prices for {self._ticker}")
+
     async def update(self):
-        self._data = await fmp_fetch_historical_prices(self._session, self._ticker, self._start_date)
+        if self._data is None or self._data.empty or not isinstance(self._data.index, pd.DatetimeIndex):
+            self._data = await fmp_fetch_historical_prices(self._session, self._ticker, self._start_date)
+        else:
+            overlap = relativedelta(days=get_config_value("data.price_overlap_days", 7))
+            from_date = max(self._data.index.max() - overlap, pd.to_datetime(self._start_date))
 
-        expiry = datetime.now() + relativedelta(months=6)
-        cache_key = f"historical_prices/{self._ticker}_{self._start_date}.feather"
+            new_data = await fmp_fetch_historical_prices(self._session, self._ticker, from_date.strftime("%Y-%m-%d"))
+
+            if not new_data.empty and self._is_restated(new_data):
+                print(f"Adjusted prices for {self._ticker} were restated, downloading the full history")
+                self._data = await fmp_fetch_historical_prices(self._session, self._ticker, self._start_date)
+            elif not new_data.empty:
+                # Bars inside the overlap are replaced so that restated recent bars take effect
+                self._data = self._merge(new_data)
+
+        self._version += 1
+
+        expiry = datetime.now() + relativedelta(days=1)
+        cache_key = f"historical_prices/{self._ticker}_{self._start_date}.parquet"
         self._cache.set(cache_key, self._data, expiry)
 
 class IncomeStatementData(Data):
@@ -151,12 +253,12 @@ class IncomeStatementData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, ticker: str, period: str) -> Self:
-        cached_data = cls._cache.get(f"income_statement_data_{period}/{ticker}.feather")
+        cached_data = cls._cache.get(f"income_statement_data_{period}/{ticker}.parquet")
 
         data = cls(session, ticker, period)
 
         if cached_data is not None:
-            data._data = cached_data
+            data._data = sort_date_index(cached_data)
         else:
             await data.update()
 
@@ -165,8 +267,10 @@ class IncomeStatementData(Data):
     async def update(self):
         self._data = await fmp_fetch_income_statement(self._session, self._ticker, self._period)
 
+        self._version += 1
+
         expiry = datetime.now() + (relativedelta(months=3) if self._period == "quarter" else relativedelta(months=6))
-        self._cache.set(f"income_statement_data_{self._period}/{self._ticker}.feather", self._data, expiry)
+        self._cache.set(f"income_statement_data_{self._period}/{self._ticker}.parquet", self._data, expiry)
 
 class BalanceSheetData(Data):
     def __init__(self, session: aiohttp.ClientSession, ticker: str, period: str):
@@ -184,12 +288,12 @@ class BalanceSheetData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, ticker: str, period: str) -> Self:
-        cached_data = cls._cache.get(f"balance_sheet_data_{period}/{ticker}.feather")
+        cached_data = cls._cache.get(f"balance_sheet_data_{period}/{ticker}.parquet")
 
         data = cls(session, ticker, period)
 
         if cached_data is not None:
-            data._data = cached_data
+            data._data = sort_date_index(cached_data)
         else:
             await data.update()
 
@@ -198,8 +302,10 @@ class BalanceSheetData(Data):
     async def update(self):
         self._data = await fmp_fetch_balance_sheet(self._session, self._ticker, self._period)
 
+        self._version += 1
+
         expiry = datetime.now() + (relativedelta(months=3) if self._period == "quarter" else relativedelta(months=6))
-        self._cache.set(f"balance_sheet_data_{self._period}/{self._ticker}.feather", self._data, expiry)
+        self._cache.set(f"balance_sheet_data_{self._period}/{self._ticker}.parquet", self._data, expiry)
 
 class CashFlowData(Data):
     def __init__(self, session: aiohttp.ClientSession, ticker: str, period: str = "quarter"):
@@ -217,12 +323,12 @@ class CashFlowData(Data):
 
     @classmethod
     async def create(cls, session: aiohttp.ClientSession, ticker: str, period: str) -> Self:
-        cached_data = cls._cache.get(f"cash_flow_data_{period}/{ticker}.feather")
+        cached_data = cls._cache.get(f"cash_flow_data_{period}/{ticker}.parquet")
 
         data = cls(session, ticker, period)
 
         if cached_data is not None:
-            data._data = cached_data
+            data._data = sort_date_index(cached_data)
         else:
             await data.update()
 
@@ -231,5 +337,7 @@ class CashFlowData(Data):
     async def update(self):
         self._data = await fmp_fetch_cash_flow(self._session, self._ticker, self._period)
 
+        self._version += 1
+
         expiry = datetime.now() + (relativedelta(months=3) if self._period == "quarter" else relativedelta(months=6))
-        self._cache.set(f"cash_flow_data_{self._period}/{self._ticker}.feather", self._data, expiry)
+        self._cache.set(f"cash_flow_data_{self._period}/{self._ticker}.parquet", self._data, expiry)
@@ -20,3 +20,27 @@ class InputError(Exception):
 
     def __str__(self) -> str:
         return self.error_message
+
+class ComponentError(Exception):
+    def __init__(self, component: str, message: str):
+        self.component = component
+        self.message = message
+        self.error_message = format_error_message("ComponentError", f"{component}: {message}")
+
+        super().__init__(self.error_message)
+
+    def __reduce__(self):
+        return (type(self), (self.component, self.message))
+
+    def __str__(self) -> str:
+        return self.error_message
+
+class ComponentNotLoadedError(ValueError):
+    def __init__(self, component: str, ticker: str):
+        self.component = component
+        self.ticker = ticker
+
+        super().__init__(f"Component '{component}' not loaded for {ticker}")
+
+    def __reduce__(self):
+        return (type(self), (self.component, self.ticker))
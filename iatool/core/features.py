@@ -0,0 +1,146 @@
+from typing import Callable, Dict, Iterable, List, Optional, Self, Union
+
+import numpy as np
+import pandas as pd
+
+from .asset import Asset
+from .error import ComponentError
+from .error import InputError
+from .panel import PricePanel
+
+class FeatureTable:
+    _statements = {
+        "income_statement": Asset.get_income_statement,
+        "balance_sheet": Asset.get_balance_sheet,
+        "cash_flow": Asset.get_cash_flow,
+    }
+
+    def __init__(self, assets: Iterable[Asset]):
+        self._assets = list(assets)
+        self._features: Dict[str, pd.Series] = {}
+
+    @property
+    def assets(self) -> List[Asset]:
+        return self._assets
+
+    @property
+    def tickers(self) -> pd.Index:
+        return pd.Index([asset.ticker for asset in self._assets], name="ticker")
+
+    def add_profile(self, field: str, name: Optional[str] = None) -> Self:
+        values = {}
+
+        for asset in self._assets:
+            try:
+                values[asset.ticker] = asset.get_profile().get(field, np.nan)
+            except (ValueError, ComponentError):
+                continue
+
+        self._features[name or field] = pd.Series(values, dtype=object).infer_objects()
+
+        return self
+
+    def add_statement(
+        self,
+        statement: str,
+        field: str,
+        period: str,
+        start_date: str,
+        end_date: str,
+        agg: Union[str, Callable] = "mean",
+        name: Optional[str] = None,
+    ) -> Self:
+        if statement not in self._statements:
+            raise InputError(f"Invalid statement '{statement}'")
+
+        getter = self._statements[statement]
+        start_date = pd.to_datetime(start_date)
+        end_date = pd.to_datetime(end_date)
+
+        columns = {}
+
+        for asset in self._assets:
+            try:
+                data = getter(asset, start_date, end_date, period)
+            except (ValueError, ComponentError):
+                continue
+
+            if not data.empty and field in data.columns:
+                columns[asset.ticker] = data[field]
+
+        self._features[name or f"{statement}_{field}_{self._agg_name(agg)}"] = self._aggregate(columns, agg)
+
+        return self
+
+    def add_prices(
+        self,
+        field: str,
+        start_date: str,
+        end_date: str,
+        agg: Union[str, Callable] = "last",
+        name: Optional[str] = None,
+    ) -> Self:
+        start_date = pd.to_datetime(start_date)
+        end_date = pd.to_datetime(end_date)
+
+        columns = {}
+
+        for asset in self._assets:
+            try:
+                data = asset.get_historical_prices(start_date, end_date)
+            except (ValueError, ComponentError):
+                continue
+
+            if not data.empty and field in data.columns:
+                columns[asset.ticker] = data[field]
+
+        self._features[name or f"prices_{field}_{self._agg_name(agg)}"] = self._aggregate(columns, agg)
+
+        return self
+
+    def add_panel(
+        self,
+        panel: PricePanel,
+        field: str,
+        start_date: str,
+        end_date: str,
+        agg: Union[str, Callable] = "last",
+        name: Optional[str] = None,
+    ) -> Self:
+        # PricePanel.tickers lists the panel directory on every access, so it is read once
+        available = set(panel.tickers)
+        tickers = [ticker for ticker in self.tickers if ticker in available]
+        matrix = panel.get(field, start_date, end_date, tickers)
+
+        if agg == "last":
+            values = matrix.ffill().iloc[-1] if not matrix.empty else pd.Series(dtype=float)
+        elif agg == "first":
+            values = matrix.bfill().iloc[0] if not matrix.empty else pd.Series(dtype=float)
+        else:
+            values = matrix.agg(agg)
+
+        self._features[name or f"prices_{field}_{self._agg_name(agg)}"] = values
+
+        return self
+
+    def add(self, name: str, values: pd.Series) -> Self:
+        self._features[name] = values
+
+        return self
+
+    def build(self) -> pd.DataFrame:
+        tickers = self.tickers
+
+        return pd.DataFrame({name: values.reindex(tickers) for name, values in self._features.items()}, index=tickers)
+
+    def _aggregate(self, columns: Dict[str, pd.Series], agg: Union[str, Callable]) -> pd.Series:
+        if not columns:
+            return pd.Series(dtype=float)
+
+        # One stacked (ticker, date) series so that the aggregation runs once across the universe
+        stacked = pd.concat(columns, names=["ticker", "date"])
+
+        return stacked.groupby(level="ticker", sort=False).agg(agg)
+
+    def _agg_name(self, agg: Union[str, Callable]) -> str:
+        return agg if isinstance(agg, str) else getattr(agg, "__name__", "agg")
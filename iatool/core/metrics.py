@@ -0,0 +1,292 @@
+import weakref
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .asset import Asset
+from .error import ComponentError
+from .error import InputError
+
+class Metrics:
+    _statements = ["income_statement", "balance_sheet", "cash_flow"]
+    _flow_statements = ["income_statement", "cash_flow"]
+    _periods_per_year = {"quarter": 4, "annual": 1}
+
+    # Spans in days between a period and the same period one year earlier, outside of which a reporting gap is assumed
+    _year_span = (300, 430)
+
+    def __init__(self, assets: Iterable[Asset], period: str = "quarter"):
+        if period not in self._periods_per_year:
+            raise InputError("Invalid period")
+
+        self._assets = list(assets)
+        self._period = period
+        self._memo: Dict[Hashable, Tuple[tuple, Any]] = {}
+
+    @property
+    def assets(self) -> List[Asset]:
+        return self._assets
+
+    @property
+    def period(self) -> str:
+        return self._period
+
+    @property
+    def tickers(self) -> pd.Index:
+        return pd.Index([asset.ticker for asset in self._assets], name="ticker")
+
+    def panel(self, statement: str) -> pd.DataFrame:
+        name = self._component_name(statement)
+
+        return self._memoize(("panel", statement), [name], lambda: self._stack(name))
+
+    def field(self, statement: str, field: str) -> pd.Series:
+        panel = self.panel(statement)
+
+        if field not in panel.columns:
+            return pd.Series(np.nan, index=panel.index, name=field)
+
+        return panel[field]
+
+    def ttm(self, statement: str, field: str) -> pd.Series:
+        if statement not in self._flow_statements:
+            raise InputError(f"Trailing sums only apply to income statement and cash flow fields, not '{statement}'")
+
+        name = self._component_name(statement)
+
+        return self._memoize(("ttm", statement, field), [name], lambda: self._trailing_sum(self.field(statement, field)))
+
+    def growth(self, statement: str, field: str, ttm: bool = False) -> pd.Series:
+        name = self._component_name(statement)
+
+        def compute() -> pd.Series:
+            values = self.ttm(statement, field) if ttm else self.field(statement, field)
+
+            return self._year_over_year(values)
+
+        return self._memoize(("growth", statement, field, ttm), [name], compute)
+
+    def gross_margin(self) -> pd.Series:
+        return self._ratio("gross_margin", ["income_statement"], lambda: self._divide(
+            self.ttm("income_statement", "gross_profit"),
+            self.ttm("income_statement", "revenue"),
+        ))
+
+    def operating_margin(self) -> pd.Series:
+        return self._ratio("operating_margin", ["income_statement"], lambda: self._divide(
+            self.ttm("income_statement", "operating_income"),
+            self.ttm("income_statement", "revenue"),
+        ))
+
+    def net_margin(self) -> pd.Series:
+        return self._ratio("net_margin", ["income_statement"], lambda: self._divide(
+            self.ttm("income_statement", "net_income"),
+            self.ttm("income_statement", "revenue"),
+        ))
+
+    def roe(self) -> pd.Series:
+        return self._ratio("roe", ["income_statement", "balance_sheet"], lambda: self._divide(
+            self.ttm("income_statement", "net_income"),
+            self._average(self.field("balance_sheet", "total_stockholders_equity")),
+            positive=True,
+        ))
+
+    def roic(self) -> pd.Series:
+        def compute() -> pd.Series:
+            income_before_tax = self.ttm("income_statement", "income_before_tax")
+            tax_rate = self._divide(self.ttm("income_statement", "income_tax_expenses"), income_before_tax).clip(0, 1)
+
+            # Loss-making years have no meaningful effective tax rate and are taxed at zero
+            tax_rate = tax_rate.where(income_before_tax > 0, 0)
+
+            nopat = self.ttm("income_statement", "operating_income") * (1 - tax_rate)
+            invested_capital = (
+                self.field("balance_sheet", "total_debt")
+                + self.field("balance_sheet", "total_stockholders_equity")
+                - self.field("balance_sheet", "cash_and_cash_equivalents")
+            )
+
+            return self._divide(nopat, self._average(invested_capital), positive=True)
+
+        return self._ratio("roic", ["income_statement", "balance_sheet"], compute)
+
+    def debt_to_equity(self) -> pd.Series:
+        return self._ratio("debt_to_equity", ["balance_sheet"], lambda: self._divide(
+            self.field("balance_sheet", "total_debt"),
+            self.field("balance_sheet", "total_stockholders_equity"),
+            positive=True,
+        ))
+
+    def net_debt_to_ebitda(self) -> pd.Series:
+        return self._ratio("net_debt_to_ebitda", ["income_statement", "balance_sheet"], lambda: self._divide(
+            self.field("balance_sheet", "net_debt"),
+            self.ttm("income_statement", "ebitda"),
+            positive=True,
+        ))
+
+    def fcf_yield(self) -> pd.Series:
+        def compute() -> pd.Series:
+            shares = self.field("income_statement", "weighted_average_shares_outstanding")
+            market_cap = shares * self._close_at(shares.index)
+
+            return self._divide(self.ttm("cash_flow", "free_cash_flow"), market_cap, positive=True)
+
+        return self._ratio("fcf_yield", ["income_statement", "cash_flow"], compute, ["historical_prices"])
+
+    def summary(self) -> pd.DataFrame:
+        ratios = {
+            "gross_margin": self.gross_margin,
+            "operating_margin": self.operating_margin,
+            "net_margin": self.net_margin,
+            "roe": self.roe,
+            "roic": self.roic,
+            "debt_to_equity": self.debt_to_equity,
+            "net_debt_to_ebitda": self.net_debt_to_ebitda,
+            "fcf_yield": self.fcf_yield,
+            "revenue_growth": lambda: self.growth("income_statement", "revenue", ttm=True),
+        }
+
+        return pd.DataFrame({name: self.latest(ratio()) for name, ratio in ratios.items()}, index=self.tickers)
+
+    def latest(self, values: pd.Series) -> pd.Series:
+        latest = values.dropna().groupby(level="ticker", sort=False).last()
+
+        return latest.reindex(self.tickers)
+
+    def _component_name(self, statement: str) -> str:
+        if statement not in self._statements:
+            raise InputError(f"Invalid statement '{statement}'")
+
+        return f"{statement}_{self._period}"
+
+    def _ratio(self, key: str, statements: List[str], compute: Callable[[], pd.Series], extra: Iterable[str] = ()) -> pd.Series:
+        names = [self._component_name(statement) for statement in statements] + list(extra)
+
+        return self._memoize(("ratio", key), names, lambda: compute().rename(key))
+
+    def _signature(self, names: List[str]) -> tuple:
+        signature = []
+
+        # Weak references compare by identity while alive, so a refreshed version or a replaced component invalidates the entry,
+        # and components dropped with release() are not kept alive by the memo
+        for asset in self._assets:
+            for name in names:
+                try:
+                    component = asset.get_component(name)
+                except (ValueError, ComponentError):
+                    component = None
+
+                reference = weakref.ref(component) if component is not None else None
+
+                signature.append((asset.ticker, name, reference, component.version if component is not None else -1))
+
+        return tuple(signature)
+
+    def _memoize(self, key: Hashable, names: List[str], compute: Callable[[], Any]) -> Any:
+        signature = self._signature(names)
+        entry = self._memo.get(key)
+
+        if entry is not None and entry[0] == signature:
+            return entry[1]
+
+        result = compute()
+        self._memo[key] = (signature, result)
+
+        return result
+
+    def _stack(self, name: str) -> pd.DataFrame:
+        frames = {}
+
+        for asset in self._assets:
+            try:
+                data = asset.get_component(name).data
+            except (ValueError, ComponentError):
+                continue
+
+            if not data.empty:
+                frames[asset.ticker] = data.select_dtypes("number").astype("float64")
+
+        if not frames:
+            return pd.DataFrame(index=pd.MultiIndex.from_arrays([[], pd.DatetimeIndex([])], names=["ticker", "date"]))
+
+        panel = pd.concat(frames, names=["ticker", "date"])
+
+        return panel[~panel.index.duplicated(keep="last")]
+
+    def _lag(self, values: pd.Series, periods: int) -> pd.Series:
+        return values.groupby(level="ticker", sort=False).shift(periods)
+
+    def _dates(self, values: pd.Series) -> pd.Series:
+        return pd.Series(values.index.get_level_values("date"), index=values.index)
+
+    def _trailing_sum(self, values: pd.Series) -> pd.Series:
+        window = self._periods_per_year[self._period]
+
+        if window == 1:
+            return values
+
+        # Windowed sums as differences of per-ticker cumulative sums, without a Python-level loop over tickers
+        sums = values.fillna(0).groupby(level="ticker", sort=False).cumsum()
+        missing = values.isna().astype("int64").groupby(level="ticker", sort=False).cumsum()
+
+        window_sums = sums - self._lag(sums, window).fillna(0)
+        window_missing = missing - self._lag(missing, window).fillna(0)
+
+        dates = self._dates(values)
+        span = (dates - self._lag(dates, window - 1)).dt.days
+
+        complete = (values.groupby(level="ticker", sort=False).cumcount() >= window - 1) & (window_missing == 0) & (span < self._year_span[0])
+
+        return window_sums.where(complete)
+
+    def _year_over_year(self, values: pd.Series) -> pd.Series:
+        window = self._periods_per_year[self._period]
+
+        base = self._lag(values, window)
+
+        dates = self._dates(values)
+        span = (dates - self._lag(dates, window)).dt.days
+
+        growth = self._divide(values - base, base.abs(), positive=True)
+
+        return growth.where(span.between(*self._year_span))
+
+    def _average(self, values: pd.Series) -> pd.Series:
+        # Average of the opening and closing balance over the trailing year, or the closing balance alone
+        base = self._lag(values, self._periods_per_year[self._period])
+
+        return ((values + base) / 2).fillna(values)
+
+    def _divide(self, numerator: pd.Series, denominator: pd.Series, positive: bool = False) -> pd.Series:
+        denominator = denominator.where(denominator > 0) if positive else denominator.where(denominator != 0)
+
+        return numerator / denominator
+
+    def _close_at(self, index: pd.MultiIndex) -> pd.Series:
+        prices = {}
+
+        for asset in self._assets:
+            try:
+                data = asset.get_component("historical_prices").data
+            except (ValueError, ComponentError):
+                continue
+
+            if not data.empty and "close" in data.columns:
+                prices[asset.ticker] = data["close"].astype("float64")
+
+        if not prices or len(index) == 0:
+            return pd.Series(np.nan, index=index)
+
+        prices = pd.concat(prices, names=["ticker", "date"]).rename("close").reset_index()
+        dates = index.to_frame(index=False)
+
+        # Close on, or last before, each statement date
+        merged = pd.merge_asof(
+            dates.reset_index().sort_values("date"),
+            prices.sort_values("date"),
+            on="date",
+            by="ticker",
+        ).sort_values("index")
+
+        return pd.Series(merged["close"].to_numpy(), index=index)
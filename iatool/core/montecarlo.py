@@ -0,0 +1,286 @@
+import math
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Iterable, List, Optional, Self, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .asset import Asset
+from .error import InputError
+from .risk import get_price_matrix
+from .risk import get_returns
+from .risk import get_shrunk_covariance
+from .risk import get_value_at_risk
+
+def _simulate_batch(
+    method: str,
+    parameters: tuple,
+    weights: np.ndarray,
+    horizon: int,
+    size: int,
+    seed: np.random.SeedSequence,
+) -> Tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+
+    if method == "gbm":
+        mean, cholesky = parameters
+        shocks = rng.standard_normal((size * horizon, len(mean)))
+
+        log_returns = (shocks @ cholesky.T).reshape(size, horizon, len(mean))
+        log_returns += mean
+    else:
+        # Whole days are drawn, in blocks of consecutive days, so cross-sectional and short-range dependence survive
+        history, block_size = parameters
+        starts = rng.integers(0, len(history) - block_size + 1, (size, math.ceil(horizon / block_size)))
+        days = (starts[..., None] + np.arange(block_size)).reshape(size, -1)[:, :horizon]
+        log_returns = history[days]
+
+    # Buy and hold, each asset compounds on its own and the portfolio is the weighted sum
+    growth = np.cumsum(log_returns, axis=1)
+    np.exp(growth, out=growth)
+
+    wealth = growth @ weights
+
+    peaks = np.maximum.accumulate(np.maximum(wealth, 1.0), axis=1)
+    drawdowns = (wealth / peaks - 1).min(axis=1)
+
+    return wealth[:, -1], drawdowns
+
+_worker_model: Optional[tuple] = None
+
+def _initialize_worker(method: str, parameters: tuple, weights: np.ndarray, horizon: int):
+    # The model is sent to each worker once, tasks then carry only a batch size and a seed
+    global _worker_model
+    _worker_model = (method, parameters, weights, horizon)
+
+def _simulate_worker_batch(size: int, seed: np.random.SeedSequence) -> Tuple[np.ndarray, np.ndarray]:
+    return _simulate_batch(*_worker_model, size, seed)
+
+class SimulationResult:
+    def __init__(
+        self,
+        terminal_wealth: np.ndarray,
+        max_drawdowns: np.ndarray,
+        initial_value: float,
+        level: float,
+        converged: bool,
+    ):
+        self._terminal_wealth = terminal_wealth
+        self._max_drawdowns = max_drawdowns
+        self._initial_value = initial_value
+        self._level = level
+        self._converged = converged
+
+    @property
+    def terminal_wealth(self) -> np.ndarray:
+        return self._terminal_wealth
+
+    @property
+    def max_drawdowns(self) -> np.ndarray:
+        return self._max_drawdowns
+
+    @property
+    def paths(self) -> int:
+        return len(self._terminal_wealth)
+
+    @property
+    def converged(self) -> bool:
+        return self._converged
+
+    @property
+    def mean_half_width(self) -> float:
+        return _half_width(self._terminal_wealth, self._level)
+
+    def summary(self) -> pd.Series:
+        terminal_returns = pd.DataFrame({"terminal_return": self._terminal_wealth / self._initial_value - 1})
+        risk = get_value_at_risk(terminal_returns, self._level).iloc[0]
+
+        low, high = np.quantile(self._terminal_wealth, [1 - self._level, self._level])
+
+        return pd.Series({
+            "paths": self.paths,
+            "mean": self._terminal_wealth.mean(),
+            "mean_half_width": self.mean_half_width,
+            "median": np.median(self._terminal_wealth),
+            "low": low,
+            "high": high,
+            "probability_of_loss": np.mean(self._terminal_wealth < self._initial_value),
+            "var": risk["var"],
+            "cvar": risk["cvar"],
+            "mean_max_drawdown": self._max_drawdowns.mean(),
+            "tail_max_drawdown": np.quantile(self._max_drawdowns, 1 - self._level),
+        })
+
+def _half_width(values: np.ndarray, level: float) -> float:
+    if len(values) < 2:
+        return math.inf
+
+    z = NormalDist().inv_cdf(0.5 + level / 2)
+
+    return z * values.std(ddof=1) / math.sqrt(len(values))
+
+def _factorize(covariance: np.ndarray) -> np.ndarray:
+    try:
+        return np.linalg.cholesky(covariance)
+    except np.linalg.LinAlgError:
+        # Pairwise-complete estimates need not be positive definite, negative eigenvalues are clipped instead
+        eigenvalues, eigenvectors = np.linalg.eigh(covariance)
+
+        return eigenvectors * np.sqrt(np.clip(eigenvalues, 0.0, None))
+
+class MonteCarlo:
+    _methods = ["gbm", "bootstrap"]
+
+    def __init__(
+        self,
+        returns: pd.DataFrame,
+        weights: Optional[pd.Series] = None,
+        method: str = "gbm",
+        horizon: int = 252,
+        block_size: int = 1,
+    ):
+        if method not in self._methods:
+            raise InputError(f"Invalid method '{method}'")
+
+        if horizon < 1 or block_size < 1:
+            raise InputError("Horizon and block size must be at least 1")
+
+        if weights is None:
+            weights = pd.Series(1.0, index=returns.columns)
+
+        weights = weights.reindex(returns.columns).fillna(0.0)
+
+        if weights.sum() <= 0:
+            raise InputError("Portfolio weights must sum to a positive value")
+
+        self._tickers = returns.columns
+        self._weights = (weights / weights.sum()).to_numpy(dtype="float64")
+        self._method = method
+        self._horizon = horizon
+
+        log_returns = np.log1p(returns)
+
+        if method == "gbm":
+            covariance, _ = get_shrunk_covariance(log_returns)
+            mean = log_returns.mean().fillna(0.0).to_numpy()
+
+            self._parameters = (mean, _factorize(covariance.to_numpy()))
+        else:
+            history = log_returns.dropna().to_numpy()
+
+            if len(history) < block_size:
+                raise InputError("Not enough complete days of returns to bootstrap from")
+
+            self._parameters = (history, block_size)
+
+    @property
+    def tickers(self) -> pd.Index:
+        return self._tickers
+
+    @property
+    def weights(self) -> pd.Series:
+        return pd.Series(self._weights, index=self._tickers)
+
+    @property
+    def method(self) -> str:
+        return self._method
+
+    @property
+    def horizon(self) -> int:
+        return self._horizon
+
+    @classmethod
+    def from_assets(
+        cls,
+        assets: Iterable[Asset],
+        start_date: str,
+        end_date: str,
+        weights: Optional[pd.Series] = None,
+        method: str = "gbm",
+        horizon: int = 252,
+        block_size: int = 1,
+    ) -> Self:
+        returns = get_returns(get_price_matrix(assets, start_date, end_date))
+
+        return cls(returns, weights, method, horizon, block_size)
+
+    def run(
+        self,
+        paths: int = 10000,
+        batch_size: Optional[int] = None,
+        processes: Optional[int] = None,
+        tolerance: Optional[float] = None,
+        level: float = 0.95,
+        seed: Optional[int] = None,
+        initial_value: float = 1.0,
+    ) -> SimulationResult:
+        # Batches are sized so that one batch of (path x day x asset) returns stays around 40 MB
+        batch_size = batch_size or max(1, min(paths, 5_000_000 // (self._horizon * len(self._weights))))
+        sizes = [min(batch_size, paths - start) for start in range(0, paths, batch_size)]
+
+        # One seed per batch rather than per worker, so results do not depend on the number of processes
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        wave = processes or 1
+
+        terminal: List[np.ndarray] = []
+        drawdowns: List[np.ndarray] = []
+        converged = False
+
+        count = 0
+        total = 0.0
+        total_squares = 0.0
+        z = NormalDist().inv_cdf(0.5 + level / 2)
+
+        executor = None
+
+        if processes:
+            executor = ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_initialize_worker,
+                initargs=(self._method, self._parameters, self._weights, self._horizon),
+            )
+
+        try:
+            for start in range(0, len(sizes), wave):
+                batch_sizes = sizes[start:start + wave]
+                batch_seeds = seeds[start:start + wave]
+
+                if executor is not None:
+                    results = executor.map(_simulate_worker_batch, batch_sizes, batch_seeds)
+                else:
+                    results = (
+                        _simulate_batch(self._method, self._parameters, self._weights, self._horizon, size, batch_seed)
+                        for size, batch_seed in zip(batch_sizes, batch_seeds)
+                    )
+
+                # Convergence is checked after every batch in seed order, so the stopping point does not depend on the wave size
+                for batch_terminal, batch_drawdowns in results:
+                    terminal.append(batch_terminal)
+                    drawdowns.append(batch_drawdowns)
+
+                    count += len(batch_terminal)
+                    total += batch_terminal.sum()
+                    total_squares += np.square(batch_terminal).sum()
+
+                    if tolerance is not None and count > 1:
+                        mean = total / count
+                        variance = max(total_squares - count * mean * mean, 0.0) / (count - 1)
+
+                        if z * math.sqrt(variance / count) <= tolerance * abs(mean):
+                            converged = True
+                            break
+
+                if converged:
+                    break
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+        return SimulationResult(
+            np.concatenate(terminal) * initial_value,
+            np.concatenate(drawdowns),
+            initial_value,
+            level,
+            converged,
+        )
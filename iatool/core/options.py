@@ -0,0 +1,283 @@
+from typing import Dict, Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .error import InputError
+
+_SQRT_2PI = np.sqrt(2 * np.pi)
+
+def norm_pdf(x: ArrayLike) -> np.ndarray:
+    x = np.asarray(x, dtype="float64")
+
+    return np.exp(-0.5 * x * x) / _SQRT_2PI
+
+def norm_cdf(x: ArrayLike) -> np.ndarray:
+    # Hart's double precision approximation as given by West (2005), absolute error below 1e-14
+    x = np.asarray(x, dtype="float64")
+    z = np.abs(x)
+    exponential = np.exp(-0.5 * z * z)
+
+    numerator = 3.52624965998911e-02 * z + 0.700383064443688
+    numerator = numerator * z + 6.37396220353165
+    numerator = numerator * z + 33.912866078383
+    numerator = numerator * z + 112.079291497871
+    numerator = numerator * z + 221.213596169931
+    numerator = numerator * z + 220.206867912376
+
+    denominator = 8.83883476483184e-02 * z + 1.75566716318264
+    denominator = denominator * z + 16.064177579207
+    denominator = denominator * z + 86.7807322029461
+    denominator = denominator * z + 296.564248779674
+    denominator = denominator * z + 637.333633378831
+    denominator = denominator * z + 793.826512519948
+    denominator = denominator * z + 440.413735824752
+
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        fraction = z + 0.65
+        fraction = z + 4 / fraction
+        fraction = z + 3 / fraction
+        fraction = z + 2 / fraction
+        fraction = z + 1 / fraction
+
+        tail = np.where(z < 7.07106781186547, exponential * numerator / denominator, exponential / fraction / 2.506628274631)
+
+    tail = np.where(z > 37, 0.0, tail)
+
+    return np.where(x > 0, 1 - tail, tail)
+
+def _broadcast(*arrays: ArrayLike) -> Tuple[np.ndarray, ...]:
+    return np.broadcast_arrays(*(np.asarray(array, dtype="float64") for array in arrays))
+
+def _generalized_price(spot, strike, time, rate, carry, volatility, call) -> np.ndarray:
+    spot, strike, time, rate, carry, volatility = _broadcast(spot, strike, time, rate, carry, volatility)
+    call = np.broadcast_to(np.asarray(call, dtype=bool), spot.shape)
+
+    carry_discount = np.exp((carry - rate) * time)
+    discount = np.exp(-rate * time)
+    deviation = volatility * np.sqrt(time)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (carry + 0.5 * volatility * volatility) * time) / deviation
+        d2 = d1 - deviation
+
+    sign = np.where(call, 1.0, -1.0)
+    price = sign * (spot * carry_discount * norm_cdf(sign * d1) - strike * discount * norm_cdf(sign * d2))
+
+    # Expired or zero-volatility options are worth their discounted intrinsic value
+    intrinsic = np.maximum(sign * (spot * carry_discount - strike * discount), 0.0)
+
+    return np.where(deviation > 0, price, intrinsic)
+
+def _generalized_greeks(spot, strike, time, rate, carry, volatility, call, futures: bool) -> Dict[str, np.ndarray]:
+    spot, strike, time, rate, carry, volatility = _broadcast(spot, strike, time, rate, carry, volatility)
+    call = np.broadcast_to(np.asarray(call, dtype=bool), spot.shape)
+
+    carry_discount = np.exp((carry - rate) * time)
+    discount = np.exp(-rate * time)
+    root_time = np.sqrt(time)
+    deviation = volatility * root_time
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(spot / strike) + (carry + 0.5 * volatility * volatility) * time) / deviation
+        d2 = d1 - deviation
+
+        sign = np.where(call, 1.0, -1.0)
+        cdf1 = norm_cdf(sign * d1)
+        cdf2 = norm_cdf(sign * d2)
+        pdf1 = norm_pdf(d1)
+
+        price = sign * (spot * carry_discount * cdf1 - strike * discount * cdf2)
+        delta = sign * carry_discount * cdf1
+        gamma = carry_discount * pdf1 / (spot * deviation)
+        vega = spot * carry_discount * pdf1 * root_time
+        theta = (
+            -spot * carry_discount * pdf1 * volatility / (2 * root_time)
+            - sign * (carry - rate) * spot * carry_discount * cdf1
+            - sign * rate * strike * discount * cdf2
+        )
+
+        # For futures the carry does not move with the rate, only the discounting does
+        rho = -time * price if futures else sign * strike * time * discount * cdf2
+
+    return {"price": price, "delta": delta, "gamma": gamma, "vega": vega, "theta": theta, "rho": rho}
+
+def _price_and_vega(spot, strike, time, rate, carry, volatility, call) -> Tuple[np.ndarray, np.ndarray]:
+    carry_spot = spot * np.exp((carry - rate) * time)
+    discounted_strike = strike * np.exp(-rate * time)
+    root_time = np.sqrt(time)
+    deviation = volatility * root_time
+
+    d1 = (np.log(carry_spot / discounted_strike) + 0.5 * deviation * deviation) / deviation
+    d2 = d1 - deviation
+
+    sign = np.where(call, 1.0, -1.0)
+    price = sign * (carry_spot * norm_cdf(sign * d1) - discounted_strike * norm_cdf(sign * d2))
+
+    return price, carry_spot * norm_pdf(d1) * root_time
+
+def black_scholes(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    call: ArrayLike = True,
+    dividend_yield: ArrayLike = 0.0,
+) -> np.ndarray:
+    return _generalized_price(spot, strike, time, rate, np.asarray(rate) - np.asarray(dividend_yield), volatility, call)
+
+def black_scholes_greeks(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    call: ArrayLike = True,
+    dividend_yield: ArrayLike = 0.0,
+) -> Dict[str, np.ndarray]:
+    carry = np.asarray(rate) - np.asarray(dividend_yield)
+
+    return _generalized_greeks(spot, strike, time, rate, carry, volatility, call, futures=False)
+
+def black_76(
+    forward: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    call: ArrayLike = True,
+) -> np.ndarray:
+    return _generalized_price(forward, strike, time, rate, 0.0, volatility, call)
+
+def black_76_greeks(
+    forward: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    call: ArrayLike = True,
+) -> Dict[str, np.ndarray]:
+    return _generalized_greeks(forward, strike, time, rate, 0.0, volatility, call, futures=True)
+
+def implied_volatility(
+    price: ArrayLike,
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    call: ArrayLike = True,
+    dividend_yield: ArrayLike = 0.0,
+    futures: bool = False,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+    bounds: Tuple[float, float] = (1e-6, 10.0),
+) -> np.ndarray:
+    carry = 0.0 if futures else np.asarray(rate) - np.asarray(dividend_yield)
+
+    price, spot, strike, time, rate, carry = _broadcast(price, spot, strike, time, rate, carry)
+    call = np.broadcast_to(np.asarray(call, dtype=bool), price.shape)
+    shape = price.shape
+
+    price, spot, strike, time, rate, carry = (array.ravel() for array in (price, spot, strike, time, rate, carry))
+    call = call.ravel()
+
+    carry_discount = np.exp((carry - rate) * time)
+    discount = np.exp(-rate * time)
+
+    # Quotes outside the no-arbitrage bounds have no implied volatility
+    lower_bound = np.where(call, np.maximum(spot * carry_discount - strike * discount, 0.0), np.maximum(strike * discount - spot * carry_discount, 0.0))
+    upper_bound = np.where(call, spot * carry_discount, strike * discount)
+    valid = (price > lower_bound) & (price < upper_bound) & (time > 0)
+
+    result = np.full(price.shape, np.nan)
+    active = np.flatnonzero(valid)
+
+    low = np.full(active.shape, bounds[0])
+    high = np.full(active.shape, bounds[1])
+
+    # Brenner-Subrahmanyam starting point, exact for at-the-money forwards
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sigma = price[active] * _SQRT_2PI / (spot[active] * carry_discount[active] * np.sqrt(time[active]))
+    sigma = np.clip(np.nan_to_num(sigma, nan=0.2), bounds[0] * 2, bounds[1] / 2)
+
+    for _ in range(max_iterations):
+        if not active.size:
+            break
+
+        model_price, vega = _price_and_vega(spot[active], strike[active], time[active], rate[active], carry[active], sigma, call[active])
+        error = model_price - price[active]
+
+        converged = np.abs(error) < tolerance
+        result[active[converged]] = sigma[converged]
+
+        # Newton steps that leave the bracket, or stall on a flat vega, fall back to bisection
+        high = np.where(error > 0, sigma, high)
+        low = np.where(error < 0, sigma, low)
+
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            step = sigma - error / vega
+
+        bisect = ~np.isfinite(step) | (step <= low) | (step >= high)
+        sigma = np.where(bisect, 0.5 * (low + high), step)
+
+        # A collapsed bracket means the volatility is known to within floating point precision
+        collapsed = (high - low) <= 1e-15 * high
+        result[active[collapsed & ~converged]] = sigma[collapsed & ~converged]
+
+        remaining = ~(converged | collapsed)
+        active, sigma, low, high = active[remaining], sigma[remaining], low[remaining], high[remaining]
+
+    return result.reshape(shape)
+
+def binomial_american(
+    spot: ArrayLike,
+    strike: ArrayLike,
+    time: ArrayLike,
+    rate: ArrayLike,
+    volatility: ArrayLike,
+    call: ArrayLike = True,
+    dividend_yield: ArrayLike = 0.0,
+    steps: int = 200,
+) -> np.ndarray:
+    if steps < 1:
+        raise InputError("A binomial tree needs at least one step")
+
+    spot, strike, time, rate, volatility, dividend_yield = _broadcast(spot, strike, time, rate, volatility, dividend_yield)
+    call = np.broadcast_to(np.asarray(call, dtype=bool), spot.shape)
+    shape = spot.shape
+
+    spot, strike, time, rate, volatility, dividend_yield = (
+        array.ravel() for array in (spot, strike, time, rate, volatility, dividend_yield)
+    )
+    sign = np.where(call.ravel(), 1.0, -1.0)
+
+    # Cox-Ross-Rubinstein tree with one column per option, so every option is rolled back at once
+    dt = time / steps
+    up = np.exp(volatility * np.sqrt(dt))
+    down = 1 / up
+    discount = np.exp(-rate * dt)
+    probability = (np.exp((rate - dividend_yield) * dt) - down) / (up - down)
+
+    up_weight = discount * probability
+    down_weight = discount * (1 - probability)
+    signed_strike = sign * strike
+
+    levels = np.arange(steps + 1)[:, None]
+    prices = sign * spot * up ** (steps - levels) * down ** levels
+    values = np.maximum(prices - signed_strike, 0.0)
+
+    for step in range(steps - 1, -1, -1):
+        # Node j at this step is reached from nodes j and j + 1 of the next, whose prices are one down move apart
+        continuation = down_weight * values[1:step + 2]
+
+        current = values[:step + 1]
+        current *= up_weight
+        current += continuation
+
+        node_prices = prices[:step + 1]
+        node_prices *= down
+
+        np.maximum(current, node_prices - signed_strike, out=current)
+
+    return values[0].reshape(shape)
@@ -0,0 +1,159 @@
+import os
+from typing import Dict, Iterable, List, Mapping, Optional, Self
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+from .asset import Asset
+from .cache import Cache
+from .error import ComponentError
+from .error import InputError
+
+class PricePanel:
+    _fields = ["open", "high", "low", "close", "adj_close", "volume", "unadjusted_volume", "vwap"]
+
+    def __init__(self, dirname: Optional[str] = None):
+        self._dirname = dirname or os.path.join(Cache().dirname, "price_panel")
+        self._tables: Dict[str, pa.Table] = {}
+        self._dates: Dict[str, np.ndarray] = {}
+
+    @property
+    def dirname(self) -> str:
+        return self._dirname
+
+    @property
+    def fields(self) -> List[str]:
+        if not os.path.isdir(self._dirname):
+            return []
+
+        return sorted(name[:-len(".arrow")] for name in os.listdir(self._dirname) if name.endswith(".arrow"))
+
+    @property
+    def tickers(self) -> List[str]:
+        fields = self.fields
+
+        if not fields:
+            return []
+
+        return self._open(fields[0]).column_names[1:]
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        fields = self.fields
+
+        if not fields:
+            return pd.DatetimeIndex([], name="date")
+
+        self._open(fields[0])
+
+        return pd.DatetimeIndex(self._dates[fields[0]], name="date")
+
+    @classmethod
+    def build(cls, prices: Mapping[str, pd.DataFrame], fields: Optional[Iterable[str]] = None, dirname: Optional[str] = None) -> Self:
+        panel = cls(dirname)
+        os.makedirs(panel._dirname, exist_ok=True)
+
+        fields = list(fields or cls._fields)
+        frames = {}
+
+        for ticker in sorted(prices):
+            frame = prices[ticker]
+
+            if frame.empty:
+                continue
+
+            frames[ticker] = frame[~frame.index.duplicated(keep="first")]
+
+        dates = pd.DatetimeIndex([], name="date")
+        for frame in frames.values():
+            dates = dates.union(frame.index)
+
+        # One uncompressed Arrow IPC file per field, laid out as (date x ticker), so that it can be memory-mapped
+        for field in fields:
+            columns = {"date": pa.array(dates.to_numpy(dtype="datetime64[ns]"))}
+
+            for ticker, frame in frames.items():
+                if field not in frame.columns:
+                    raise InputError(f"Field '{field}' missing from prices for {ticker}")
+
+                columns[ticker] = pa.array(frame[field].reindex(dates).to_numpy(dtype="float64"), from_pandas=True)
+
+            table = pa.table(columns)
+
+            final_path = os.path.join(panel._dirname, f"{field}.arrow")
+            temp_path = f"{final_path}.tmp"
+
+            with pa.OSFile(temp_path, "wb") as sink:
+                with ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+
+            os.replace(temp_path, final_path)
+
+        return panel
+
+    @classmethod
+    def from_assets(
+        cls,
+        assets: Iterable[Asset],
+        start_date: str = "1900-01-01",
+        end_date: str = "2100-01-01",
+        fields: Optional[Iterable[str]] = None,
+        dirname: Optional[str] = None,
+    ) -> Self:
+        prices = {}
+
+        # Assets whose prices failed to load, or have no bars in the window, are left out of the panel
+        for asset in assets:
+            try:
+                data = asset.get_historical_prices(start_date, end_date)
+            except (ValueError, ComponentError):
+                continue
+
+            if not data.empty:
+                prices[asset.ticker] = data
+
+        return cls.build(prices, fields, dirname)
+
+    def _open(self, field: str) -> pa.Table:
+        table = self._tables.get(field)
+
+        if table is None:
+            path = os.path.join(self._dirname, f"{field}.arrow")
+
+            if not os.path.exists(path):
+                raise InputError(f"Field '{field}' not available in price panel")
+
+            table = ipc.open_file(pa.memory_map(path, "r")).read_all()
+
+            self._tables[field] = table
+            self._dates[field] = table.column("date").to_numpy()
+
+        return table
+
+    def get(self, field: str, start_date: str, end_date: str, tickers: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        table = self._open(field)
+        dates = self._dates[field]
+
+        start = np.searchsorted(dates, np.datetime64(pd.to_datetime(start_date), "ns"), side="left")
+        end = np.searchsorted(dates, np.datetime64(pd.to_datetime(end_date), "ns"), side="right")
+
+        sliced = table.slice(start, end - start)
+
+        if tickers is not None:
+            tickers = list(tickers)
+            available = set(table.column_names)
+            missing = [ticker for ticker in tickers if ticker not in available]
+
+            if missing:
+                missing_str = ", ".join(missing)
+                raise InputError(f"Tickers not available in price panel: {missing_str}")
+
+            sliced = sliced.select(["date", *tickers])
+
+        data = sliced.to_pandas()
+        data.set_index("date", inplace=True)
+        data.columns.name = "ticker"
+
+        return data
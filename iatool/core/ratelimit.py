@@ -0,0 +1,46 @@
+import time
+import asyncio
+from typing import Optional, Self
+
+from .config import get_config_value
+
+class RateLimiter:
+    _instance: Optional[Self] = None
+
+    def __new__(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+
+            rate = get_config_value("api.fmp.requests_per_minute", 300) / 60
+            cls._instance._rate = rate
+            cls._instance._capacity = get_config_value("api.fmp.burst", max(1.0, rate))
+            cls._instance._tokens = cls._instance._capacity
+            cls._instance._updated = time.monotonic()
+
+        return cls._instance
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self._capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    async def acquire(self):
+        # Tokens may go negative: each caller reserves the next free slot
+        # and sleeps until it, which keeps waiters in FIFO order.
+        self._refill()
+        self._tokens -= 1
+
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self._rate)
+
+    def pause(self, delay: float):
+        self._refill()
+        self._tokens = min(self._tokens, 0.0) - delay * self._rate
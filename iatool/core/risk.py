@@ -0,0 +1,180 @@
+from statistics import NormalDist
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .asset import Asset
+from .error import ComponentError
+from .error import InputError
+from .util import get_date_ranges
+
+def get_price_matrix(assets: Iterable[Asset], start_date: str, end_date: str, field: str = "adj_close") -> pd.DataFrame:
+    frames = {}
+
+    for asset in assets:
+        try:
+            frames[asset.ticker] = asset.get_component("historical_prices").data
+        except (ValueError, ComponentError):
+            continue
+
+    columns = {}
+
+    # The window is parsed once for the whole universe rather than once per asset
+    for ticker, data in zip(frames, get_date_ranges(frames.values(), start_date, end_date)):
+        if not data.empty and field in data.columns:
+            columns[ticker] = data[field][~data.index.duplicated(keep="last")]
+
+    matrix = pd.concat(columns, axis=1).sort_index() if columns else pd.DataFrame()
+    matrix.columns.name = "ticker"
+
+    return matrix
+
+def get_returns(prices: pd.DataFrame, log: bool = False) -> pd.DataFrame:
+    # A return needs both bars, missing prices are not filled
+    ratio = prices / prices.shift(1)
+
+    return (np.log(ratio) if log else ratio - 1).iloc[1:]
+
+def _center(returns: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    values = returns.to_numpy(dtype="float64")
+    mask = ~np.isnan(values)
+
+    filled = np.where(mask, values, 0.0)
+    means = filled.sum(axis=0) / np.maximum(mask.sum(axis=0), 1)
+
+    return np.where(mask, filled - means, 0.0), mask
+
+def get_covariance(
+    returns: pd.DataFrame,
+    min_periods: int = 2,
+    block_size: int = 512,
+    dtype: str = "float64",
+) -> pd.DataFrame:
+    centered, mask = _center(returns)
+
+    # Centering first keeps the products small, which is what makes float32 usable
+    centered = centered.astype(dtype)
+    valid = mask.astype(dtype)
+
+    count = centered.shape[1]
+    covariance = np.empty((count, count), dtype=dtype)
+
+    # Pairwise-complete covariance built block by block from matrix products, the only N x N array is the result
+    for i in range(0, count, block_size):
+        rows = slice(i, i + block_size)
+
+        for j in range(i, count, block_size):
+            columns = slice(j, j + block_size)
+
+            pairs = valid[:, rows].T @ valid[:, columns]
+            products = centered[:, rows].T @ centered[:, columns]
+            row_sums = centered[:, rows].T @ valid[:, columns]
+            column_sums = valid[:, rows].T @ centered[:, columns]
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                block = (products - row_sums * column_sums / pairs) / (pairs - 1)
+
+            block[pairs < max(min_periods, 2)] = np.nan
+
+            covariance[rows, columns] = block
+            covariance[columns, rows] = block.T
+
+    return pd.DataFrame(covariance, index=returns.columns, columns=returns.columns)
+
+def get_shrunk_covariance(
+    returns: pd.DataFrame,
+    min_periods: int = 2,
+    block_size: int = 512,
+    dtype: str = "float64",
+) -> Tuple[pd.DataFrame, float]:
+    covariance = get_covariance(returns, min_periods, block_size, dtype)
+    sample = np.nan_to_num(covariance.to_numpy(dtype="float64"))
+
+    centered, _ = _center(returns)
+
+    periods, count = centered.shape
+
+    if periods < 2 or count == 0:
+        raise InputError("At least two periods of returns are required")
+
+    # Ledoit-Wolf shrinkage towards a scaled identity, missing returns are treated as the mean
+    biased = sample * (periods - 1) / periods
+    mu = np.trace(biased) / count
+    target_distance = (np.sum(biased ** 2) - 2 * mu * np.trace(biased) + mu ** 2 * count) / count
+
+    squared_norms = np.sum(centered ** 2, axis=1)
+    estimation_error = (np.sum(squared_norms ** 2) - periods * np.sum(biased ** 2)) / (periods ** 2 * count)
+
+    shrinkage = float(np.clip(estimation_error / target_distance, 0.0, 1.0)) if target_distance > 0 else 1.0
+
+    shrunk = (1 - shrinkage) * sample + shrinkage * np.trace(sample) / count * np.eye(count)
+
+    return pd.DataFrame(shrunk.astype(dtype), index=covariance.index, columns=covariance.columns), shrinkage
+
+def get_correlation(covariance: pd.DataFrame) -> pd.DataFrame:
+    deviations = np.sqrt(np.diag(covariance.to_numpy()))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        correlation = covariance.to_numpy() / np.outer(deviations, deviations)
+
+    return pd.DataFrame(np.clip(correlation, -1, 1), index=covariance.index, columns=covariance.columns)
+
+def get_rolling_beta(
+    returns: pd.DataFrame,
+    benchmark: pd.Series,
+    window: int = 252,
+    min_periods: Optional[int] = None,
+) -> pd.DataFrame:
+    benchmark = benchmark.reindex(returns.index)
+    min_periods = min_periods or window // 2
+
+    # Rolling sums over the bars where both the ticker and the benchmark have a return
+    valid = returns.notna() & benchmark.notna().to_numpy()[:, None]
+    x = returns.where(valid, 0.0)
+    y = valid.mul(benchmark.fillna(0.0), axis=0)
+
+    def rolling_sum(data: pd.DataFrame) -> pd.DataFrame:
+        return data.rolling(window, min_periods=1).sum()
+
+    n = rolling_sum(valid.astype("float64"))
+    sum_x = rolling_sum(x)
+    sum_y = rolling_sum(y)
+
+    covariance = rolling_sum(x * y) - sum_x * sum_y / n
+    variance = rolling_sum(y * y) - sum_y ** 2 / n
+
+    beta = covariance / variance.where(variance > 0)
+
+    return beta.where(n >= min_periods)
+
+def get_value_at_risk(returns: pd.DataFrame, level: float = 0.95, method: str = "historical") -> pd.DataFrame:
+    if not 0 < level < 1:
+        raise InputError("Confidence level must be between 0 and 1")
+
+    if isinstance(returns, pd.Series):
+        returns = returns.to_frame()
+
+    values = returns.to_numpy(dtype="float64")
+    tail = 1 - level
+
+    if method == "historical":
+        quantile = np.nanquantile(values, tail, axis=0)
+
+        losses = np.where(values <= quantile, values, np.nan)
+        with np.errstate(invalid="ignore"):
+            shortfall = np.nanmean(losses, axis=0)
+    elif method == "parametric":
+        mean = np.nanmean(values, axis=0)
+        deviation = np.nanstd(values, axis=0, ddof=1)
+
+        normal = NormalDist()
+        z = normal.inv_cdf(tail)
+
+        quantile = mean + z * deviation
+        shortfall = mean - deviation * normal.pdf(z) / tail
+    else:
+        raise InputError(f"Invalid method '{method}'")
+
+    # Losses are reported as positive fractions of value
+    return pd.DataFrame({"var": -quantile, "cvar": -shortfall}, index=returns.columns)
@@ -1,6 +1,128 @@
-from typing import List, Optional, Self, Callable
+import os
+import math
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterable, AsyncIterator, Dict, Iterable, List, Optional, Self, Callable, Tuple, Union
+
+import aiohttp
+import pandas as pd
 
 from .asset import Asset
+from .config import get_config_value
+from .data import CompanyProfileData
+from .error import ComponentNotLoadedError
+from .error import InputError
+from .universe import Universe
+
+def _run_chunk(predicate: Callable[[Asset], bool], assets: List[Asset]) -> List[Tuple[bool, Optional[Exception]]]:
+    results = []
+
+    for asset in assets:
+        try:
+            results.append((bool(predicate(asset)), None))
+        except Exception as error:
+            results.append((False, error))
+
+    return results
+
+class _RequirementRecorder:
+    def __init__(self):
+        self.ticker = ""
+        self.requires: Dict[str, None] = {}
+        self.start_date: Optional[pd.Timestamp] = None
+
+    def get_profile(self) -> pd.Series:
+        self.requires["profile"] = None
+
+        return pd.Series(dtype=object)
+
+    def get_historical_prices(self, start_date: str, end_date: str) -> pd.DataFrame:
+        self.requires["historical_prices"] = None
+
+        start_date = pd.to_datetime(start_date)
+        if self.start_date is None or start_date < self.start_date:
+            self.start_date = start_date
+
+        return self._empty()
+
+    def get_income_statement(self, start_date: str, end_date: str, period: str) -> pd.DataFrame:
+        return self._record_statement("income_statement", period)
+
+    def get_balance_sheet(self, start_date: str, end_date: str, period: str) -> pd.DataFrame:
+        return self._record_statement("balance_sheet", period)
+
+    def get_cash_flow(self, start_date: str, end_date: str, period: str) -> pd.DataFrame:
+        return self._record_statement("cash_flow", period)
+
+    def _record_statement(self, statement: str, period: str) -> pd.DataFrame:
+        if period not in ("quarter", "annual"):
+            raise InputError("Invalid period")
+
+        self.requires[f"{statement}_{period}"] = None
+
+        return self._empty()
+
+    def _empty(self) -> pd.DataFrame:
+        return pd.DataFrame(index=pd.DatetimeIndex([], name="date"))
+
+class Screen:
+    _canonical_start_date = "1990-01-01"
+
+    def __init__(
+        self,
+        predicate: Callable[[Asset], bool],
+        requires: Optional[Iterable[str]] = None,
+        profile_filter: Optional[Union[str, Callable[[pd.Series], bool]]] = None,
+        start_date: Optional[str] = None,
+    ):
+        self._predicate = predicate
+        self._profile_filter = profile_filter
+
+        if requires is None:
+            requires, inferred_start_date = self._infer(predicate)
+
+            # The start date is part of the price cache key, so prices are fetched from the canonical start and the
+            # predicate slices its own window; the download is only extended when the window starts earlier
+            if start_date is None and inferred_start_date is not None and inferred_start_date < self._canonical_start_date:
+                start_date = inferred_start_date
+
+        requires = list(dict.fromkeys(requires))
+
+        for name in requires:
+            if name not in Asset._components:
+                raise InputError(f"Invalid component '{name}'")
+
+        self._requires = requires
+        self._start_date = start_date or self._canonical_start_date
+
+    @property
+    def predicate(self) -> Callable[[Asset], bool]:
+        return self._predicate
+
+    @property
+    def requires(self) -> List[str]:
+        return self._requires
+
+    @property
+    def profile_filter(self) -> Optional[Union[str, Callable[[pd.Series], bool]]]:
+        return self._profile_filter
+
+    @property
+    def start_date(self) -> str:
+        return self._start_date
+
+    def _infer(self, predicate: Callable[[Asset], bool]) -> Tuple[List[str], Optional[str]]:
+        recorder = _RequirementRecorder()
+
+        # The predicate is run once against empty frames, every getter it reaches is recorded
+        try:
+            predicate(recorder)
+        except Exception as error:
+            print(f"Screen requirements may be incomplete after {error!r}, missing components are loaded on first use")
+
+        start_date = recorder.start_date.strftime("%Y-%m-%d") if recorder.start_date is not None else None
+
+        return list(recorder.requires), start_date
 
 class ScreenTool:
     _instance: Optional[Self] = None
@@ -8,14 +130,286 @@ class ScreenTool:
     def __new__(cls) -> Self:
         if cls._instance is None:
             cls._instance = super().__new__(cls)
+            cls._instance._errors = {}
 
         return cls._instance
+
+    @property
+    def errors(self) -> Dict[str, Exception]:
+        return self._errors
     
-    def run(self, assets: List[Asset], predicate: Callable[[Asset], bool]) -> List[Asset]:
+    def run(
+        self,
+        assets: List[Asset],
+        predicate: Union[Callable[[Asset], bool], str, pd.Series],
+        table: Optional[pd.DataFrame] = None,
+        processes: Optional[int] = None,
+        chunksize: Optional[int] = None,
+    ) -> List[Asset]:
+        self._errors = {}
+
+        if callable(predicate):
+            # Both paths collect exceptions raised for individual assets in errors and exclude those assets
+            if processes is not None:
+                return self._run_parallel(assets, predicate, processes, chunksize)
+
+            return self._collect(assets, _run_chunk(predicate, assets))
+
+        mask = self.evaluate(predicate, table)
+        mask = mask.reindex([asset.ticker for asset in assets]).eq(True)
+
+        return [asset for asset, selected in zip(assets, mask.to_numpy()) if selected]
+
+    def _run_parallel(
+        self,
+        assets: List[Asset],
+        predicate: Callable[[Asset], bool],
+        processes: int,
+        chunksize: Optional[int] = None,
+    ) -> List[Asset]:
+        return self._collect(assets, self._run_chunks(assets, predicate, processes, chunksize))
+
+    def _run_chunks(
+        self,
+        assets: List[Asset],
+        predicate: Callable[[Asset], bool],
+        processes: int,
+        chunksize: Optional[int] = None,
+    ) -> List[Tuple[bool, Optional[Exception]]]:
+        processes = processes or os.cpu_count() or 1
+        chunksize = chunksize or max(1, math.ceil(len(assets) / (processes * 4)))
+
+        chunks = [assets[i:i + chunksize] for i in range(0, len(assets), chunksize)]
+        results = []
+
+        # Each chunk is pickled once with its assets' frames, only the verdicts are sent back
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            futures = [executor.submit(_run_chunk, predicate, chunk) for chunk in chunks]
+
+            for chunk, future in zip(chunks, futures):
+                try:
+                    results.extend(future.result())
+                except Exception as error:
+                    results.extend([(False, error)] * len(chunk))
+
+        return results
+
+    def _collect(self, assets: List[Asset], results: List[Tuple[bool, Optional[Exception]]]) -> List[Asset]:
         filtered_assets = []
 
-        for asset in assets:
-            if predicate(asset):
+        for asset, (selected, error) in zip(assets, results):
+            if error is not None:
+                self._errors[asset.ticker] = error
+            elif selected:
                 filtered_assets.append(asset)
 
+        if self._errors:
+            print(f"Screen failed for {len(self._errors)} of {len(assets)} assets")
+
         return filtered_assets
+
+    async def _evaluate(
+        self,
+        assets: List[Asset],
+        predicate: Callable[[Asset], bool],
+        processes: Optional[int] = None,
+    ) -> List[Tuple[bool, Optional[Exception]]]:
+        results: List[Tuple[bool, Optional[Exception]]] = [(False, None)] * len(assets)
+        pending = list(range(len(assets)))
+
+        # Requirements inferred from empty frames can miss components, these are loaded when first reached and the asset is screened again
+        while pending:
+            pending_assets = [assets[i] for i in pending]
+
+            if processes is not None:
+                verdicts = self._run_chunks(pending_assets, predicate, processes)
+            else:
+                verdicts = _run_chunk(predicate, pending_assets)
+
+            retry = []
+
+            for i, asset, (selected, error) in zip(pending, pending_assets, verdicts):
+                if isinstance(error, ComponentNotLoadedError) and error.component not in asset.loaded and error.component not in asset.errors:
+                    retry.append((i, error.component))
+                else:
+                    results[i] = (selected, error)
+
+            await asyncio.gather(*(assets[i].load(component) for i, component in retry))
+
+            pending = [i for i, _ in retry]
+
+        return results
+
+    async def screen(
+        self,
+        session: aiohttp.ClientSession,
+        tickers: Iterable[str],
+        screen: Screen,
+        concurrency: Optional[int] = None,
+        processes: Optional[int] = None,
+    ) -> List[Asset]:
+        tickers = list(dict.fromkeys(tickers))
+        profiles = {}
+
+        if screen.profile_filter is not None or "profile" in screen.requires:
+            profiles = await CompanyProfileData.create_many(session, tickers)
+
+        # Cheap profile criteria run first, so excluded tickers never fetch their statements or prices
+        if screen.profile_filter is not None:
+            tickers = self._filter_profiles(tickers, profiles, screen.profile_filter)
+
+        universe = await Universe.create(session, tickers, concurrency, lazy=True, start_date=screen.start_date)
+
+        for ticker, profile in profiles.items():
+            if ticker in universe:
+                universe[ticker].attach("profile", profile)
+
+        if screen.requires:
+            await universe.load(*screen.requires, concurrency=concurrency)
+
+        self._errors = {}
+        results = await self._evaluate(universe.assets, screen.predicate, processes)
+
+        return self._collect(universe.assets, results)
+
+    async def stream(
+        self,
+        session: aiohttp.ClientSession,
+        tickers: Union[Iterable[str], AsyncIterable[str]],
+        screen: Union[Screen, Callable[[Asset], bool]],
+        concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Asset]:
+        if not isinstance(screen, Screen):
+            screen = Screen(screen)
+
+        self._errors = {}
+
+        concurrency = concurrency or get_config_value("universe.concurrency", 16)
+        batch_size = get_config_value("api.fmp.batch_size", 50)
+        needs_profiles = screen.profile_filter is not None or "profile" in screen.requires
+
+        # Both queues are bounded, so at most a few batches of tickers and the assets being screened are held at once
+        inputs: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+        outputs: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+
+        async def enqueue(batch: List[str]):
+            profiles = await CompanyProfileData.create_many(session, batch) if needs_profiles else {}
+
+            if screen.profile_filter is not None:
+                batch = self._filter_profiles(batch, profiles, screen.profile_filter)
+
+            for ticker in batch:
+                await inputs.put((ticker, profiles.get(ticker)))
+
+        async def stop():
+            for _ in range(concurrency):
+                await inputs.put(None)
+
+        async def produce():
+            seen = set()
+            batch = []
+
+            try:
+                async for ticker in self._iterate(tickers):
+                    if ticker in seen:
+                        continue
+
+                    seen.add(ticker)
+                    batch.append(ticker)
+
+                    if len(batch) >= batch_size:
+                        await enqueue(batch)
+                        batch = []
+
+                if batch:
+                    await enqueue(batch)
+            except Exception:
+                # The workers still drain and stop, the error is raised once the stream ends
+                await stop()
+                raise
+
+            await stop()
+
+        async def work():
+            while (item := await inputs.get()) is not None:
+                ticker, profile = item
+
+                try:
+                    asset = await Asset.create(session, ticker, profile=profile, lazy=True, start_date=screen.start_date)
+                    await asset.load(*screen.requires)
+
+                    (selected, error), = await self._evaluate([asset], screen.predicate)
+                except Exception as load_error:
+                    selected, error = False, load_error
+
+                if error is not None:
+                    self._errors[ticker] = error
+                    continue
+
+                if selected:
+                    await outputs.put(asset)
+                else:
+                    asset.release()
+
+            await outputs.put(None)
+
+        producer = asyncio.create_task(produce())
+        workers = [asyncio.create_task(work()) for _ in range(concurrency)]
+
+        try:
+            finished = 0
+
+            while finished < concurrency:
+                asset = await outputs.get()
+
+                if asset is None:
+                    finished += 1
+                    continue
+
+                yield asset
+
+            await producer
+        finally:
+            for task in (producer, *workers):
+                task.cancel()
+
+            await asyncio.gather(producer, *workers, return_exceptions=True)
+
+    async def _iterate(self, tickers: Union[Iterable[str], AsyncIterable[str]]) -> AsyncIterator[str]:
+        if hasattr(tickers, "__aiter__"):
+            async for ticker in tickers:
+                yield ticker
+        else:
+            for ticker in tickers:
+                yield ticker
+
+    def _filter_profiles(
+        self,
+        tickers: List[str],
+        profiles: Dict[str, CompanyProfileData],
+        profile_filter: Union[str, Callable[[pd.Series], bool]],
+    ) -> List[str]:
+        if callable(profile_filter):
+            selected = {ticker for ticker, profile in profiles.items() if profile_filter(profile.data)}
+        else:
+            table = pd.DataFrame.from_dict({ticker: profile.data for ticker, profile in profiles.items()}, orient="index")
+            selected = set(table.index[self.evaluate(profile_filter, table.infer_objects()).eq(True)])
+
+        print(f"Profile filter kept {len(selected)} of {len(tickers)} tickers")
+
+        return [ticker for ticker in tickers if ticker in selected]
+
+    def evaluate(self, predicate: Union[str, pd.Series], table: Optional[pd.DataFrame] = None) -> pd.Series:
+        if isinstance(predicate, str):
+            if table is None:
+                raise InputError("A feature table is required to evaluate an expression screen")
+
+            # Evaluated once across the whole table, comparisons against missing features are False
+            mask = table.eval(predicate)
+        else:
+            mask = predicate
+
+        if not isinstance(mask, pd.Series):
+            raise InputError("Screen expression must evaluate to a boolean series")
+
+        return mask
@@ -0,0 +1,91 @@
+import asyncio
+import inspect
+import functools
+from typing import Any, Awaitable, Callable, Hashable, Optional, Self
+
+class SingleFlight:
+    _instance: Optional[Self] = None
+
+    def __new__(cls) -> Self:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._in_flight = {}
+            cls._instance._waiters = {}
+            cls._instance._calls = 0
+            cls._instance._duplicates_avoided = 0
+
+        return cls._instance
+
+    @property
+    def calls(self) -> int:
+        return self._calls
+
+    @property
+    def duplicates_avoided(self) -> int:
+        return self._duplicates_avoided
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._in_flight)
+
+    async def run(self, key: Hashable, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        self._calls += 1
+
+        task = self._in_flight.get(key)
+
+        if task is not None:
+            self._duplicates_avoided += 1
+        else:
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            self._in_flight[key] = task
+            self._waiters[task] = 0
+            task.add_done_callback(lambda done: self._finish(key, done))
+
+        self._waiters[task] += 1
+
+        try:
+            # Shield the shared task so that one cancelled caller does not cancel it for the others
+            return await asyncio.shield(task)
+        finally:
+            # Once the last caller has gone the result is no longer wanted, so the request is not left running
+            if task in self._waiters:
+                self._waiters[task] -= 1
+
+                if self._waiters[task] == 0 and not task.done():
+                    task.cancel()
+
+                    if self._in_flight.get(key) is task:
+                        del self._in_flight[key]
+
+    def _finish(self, key: Hashable, task: asyncio.Task):
+        self._waiters.pop(task, None)
+
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+        if not task.cancelled():
+            task.exception()
+
+def freeze_key(value: Any) -> Hashable:
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_key(item) for item in value)
+
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze_key(item)) for key, item in value.items()))
+
+    return value
+
+def single_flight(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(session, *args, **kwargs):
+        arguments = signature.bind(session, *args, **kwargs)
+        arguments.apply_defaults()
+
+        # The session is left out of the key so that requests made on different sessions are shared too
+        key = (func.__qualname__, freeze_key(list(arguments.arguments.values())[1:]))
+
+        return await SingleFlight().run(key, func, session, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,234 @@
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from .error import InputError
+
+def ema_recursion(values: np.ndarray, alpha: float, state: np.ndarray) -> tuple:
+    # Rows are advanced one at a time but every ticker at once, missing values carry the previous average forward
+    output = np.empty_like(values)
+
+    for i, row in enumerate(values):
+        valid = ~np.isnan(row)
+        seeded = ~np.isnan(state)
+
+        state = np.where(valid & seeded, state + alpha * (row - state), state)
+        state = np.where(valid & ~seeded, row, state)
+
+        output[i] = state
+
+    return output, state
+
+class Indicator:
+    def __init__(self):
+        self._columns: Optional[pd.Index] = None
+        self._last_date: Optional[pd.Timestamp] = None
+        self._last_price: Optional[np.ndarray] = None
+
+    @property
+    def columns(self) -> Optional[pd.Index]:
+        return self._columns
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        return self._last_date
+
+    @classmethod
+    def compute(cls, *prices: pd.DataFrame, **kwargs):
+        return cls(**kwargs).update(*prices)
+
+    def _check(self, prices: pd.DataFrame) -> pd.DataFrame:
+        if not isinstance(prices.index, pd.DatetimeIndex):
+            raise InputError("Prices must be indexed by date")
+
+        if not prices.index.is_monotonic_increasing or prices.index.has_duplicates:
+            raise InputError("Prices must be in strictly ascending date order")
+
+        if self._columns is None:
+            self._columns = prices.columns
+        else:
+            extra = prices.columns.difference(self._columns)
+
+            if len(extra):
+                extra_str = ", ".join(map(str, extra))
+                raise InputError(f"Tickers not tracked by this indicator: {extra_str}")
+
+            prices = prices.reindex(columns=self._columns)
+
+        if len(prices) and self._last_date is not None and prices.index[0] <= self._last_date:
+            raise InputError(f"New bars must start after {self._last_date:%Y-%m-%d}")
+
+        return prices.astype("float64")
+
+    def _advance(self, prices: pd.DataFrame):
+        if len(prices):
+            self._last_date = prices.index[-1]
+
+    def _previous(self, prices: pd.DataFrame) -> pd.DataFrame:
+        # The last known price of each ticker before every bar, carried across missing bars and between updates
+        last = self._last_price if self._last_price is not None else np.full(len(prices.columns), np.nan)
+
+        combined = pd.concat([pd.DataFrame([last], columns=prices.columns), prices], ignore_index=True).ffill()
+        self._last_price = combined.iloc[-1].to_numpy()
+
+        return combined.iloc[:-1].set_axis(prices.index)
+
+    def _frame(self, values: np.ndarray, prices: pd.DataFrame) -> pd.DataFrame:
+        return pd.DataFrame(values, index=prices.index, columns=self._columns)
+
+class _RollingIndicator(Indicator):
+    def __init__(self, window: int, min_periods: Optional[int] = None):
+        super().__init__()
+
+        if window < 1:
+            raise InputError("Window must be at least 1")
+
+        self._window = window
+        self._min_periods = min_periods or window
+        self._tail: Optional[pd.DataFrame] = None
+
+    @property
+    def window(self) -> int:
+        return self._window
+
+    def _rolling(self, values: pd.DataFrame):
+        # Only the last window - 1 rows are kept, so an update costs O(new bars + window)
+        combined = values if self._tail is None else pd.concat([self._tail, values])
+        self._tail = combined.iloc[-(self._window - 1):] if self._window > 1 else combined.iloc[:0]
+
+        return combined.rolling(self._window, min_periods=self._min_periods), len(values)
+
+class SMA(_RollingIndicator):
+    def update(self, prices: pd.DataFrame) -> pd.DataFrame:
+        prices = self._check(prices)
+        rolling, count = self._rolling(prices)
+        self._advance(prices)
+
+        return rolling.mean().iloc[len(rolling.obj) - count:]
+
+class BollingerBands(_RollingIndicator):
+    def __init__(self, window: int = 20, width: float = 2.0, min_periods: Optional[int] = None):
+        super().__init__(window, min_periods)
+        self._width = width
+
+    def update(self, prices: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        prices = self._check(prices)
+        rolling, count = self._rolling(prices)
+        self._advance(prices)
+
+        start = len(rolling.obj) - count
+        middle = rolling.mean().iloc[start:]
+        deviation = rolling.std(ddof=0).iloc[start:]
+
+        return {
+            "middle": middle,
+            "upper": middle + self._width * deviation,
+            "lower": middle - self._width * deviation,
+            "bandwidth": 2 * self._width * deviation / middle,
+        }
+
+class Volatility(_RollingIndicator):
+    def __init__(self, window: int = 21, periods_per_year: int = 252, min_periods: Optional[int] = None):
+        super().__init__(window, min_periods)
+        self._periods_per_year = periods_per_year
+
+    def update(self, prices: pd.DataFrame) -> pd.DataFrame:
+        prices = self._check(prices)
+
+        # Log returns against the last known price of each ticker, missing bars have no return
+        returns = np.log(prices / self._previous(prices))
+
+        rolling, count = self._rolling(returns)
+        self._advance(prices)
+
+        return rolling.std().iloc[len(rolling.obj) - count:] * np.sqrt(self._periods_per_year)
+
+class EMA(Indicator):
+    def __init__(self, span: Optional[int] = None, alpha: Optional[float] = None):
+        super().__init__()
+
+        if (span is None) == (alpha is None):
+            raise InputError("Exactly one of span or alpha is required")
+
+        self._alpha = alpha if alpha is not None else 2 / (span + 1)
+        self._state: Optional[np.ndarray] = None
+
+    @property
+    def alpha(self) -> float:
+        return self._alpha
+
+    def update(self, prices: pd.DataFrame) -> pd.DataFrame:
+        prices = self._check(prices)
+
+        if self._state is None:
+            self._state = np.full(len(self._columns), np.nan)
+
+        values, self._state = ema_recursion(prices.to_numpy(), self._alpha, self._state)
+        self._advance(prices)
+
+        return self._frame(values, prices)
+
+class RSI(Indicator):
+    def __init__(self, window: int = 14):
+        super().__init__()
+
+        self._window = window
+        self._gain = EMA(alpha=1 / window)
+        self._loss = EMA(alpha=1 / window)
+
+    def update(self, prices: pd.DataFrame) -> pd.DataFrame:
+        prices = self._check(prices)
+
+        change = prices - self._previous(prices)
+
+        # Wilder smoothing of gains and losses
+        gain = self._gain.update(change.clip(lower=0).where(change.notna()))
+        loss = self._loss.update((-change).clip(lower=0).where(change.notna()))
+        self._advance(prices)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rsi = 100 - 100 / (1 + gain / loss)
+
+        return rsi.where(loss != 0, 100.0).where(gain.notna())
+
+class MACD(Indicator):
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        super().__init__()
+
+        self._fast = EMA(fast)
+        self._slow = EMA(slow)
+        self._signal = EMA(signal)
+
+    def update(self, prices: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        prices = self._check(prices)
+
+        macd = self._fast.update(prices) - self._slow.update(prices)
+        signal = self._signal.update(macd)
+        self._advance(prices)
+
+        return {"macd": macd, "signal": signal, "histogram": macd - signal}
+
+class ATR(Indicator):
+    def __init__(self, window: int = 14):
+        super().__init__()
+
+        self._window = window
+        self._average = EMA(alpha=1 / window)
+
+    def update(self, high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+        close = self._check(close)
+        high = high.reindex(index=close.index, columns=self._columns).astype("float64")
+        low = low.reindex(index=close.index, columns=self._columns).astype("float64")
+
+        previous = self._previous(close).to_numpy()
+        span = (high - low).to_numpy()
+
+        # The first bar of a ticker has no previous close and uses the high-low range alone
+        true_range = np.fmax(span, np.fmax(np.abs(high.to_numpy() - previous), np.abs(low.to_numpy() - previous)))
+        true_range[np.isnan(span)] = np.nan
+
+        values = self._average.update(self._frame(true_range, close))
+        self._advance(close)
+
+        return values
@@ -0,0 +1,158 @@
+import time
+import asyncio
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Self
+
+import aiohttp
+
+from .asset import Asset
+from .config import get_config_value
+from .data import CompanyProfileData
+
+class Universe:
+    def __init__(self, assets: Optional[Dict[str, Asset]] = None, failures: Optional[Dict[str, Exception]] = None):
+        self._assets = assets if assets is not None else {}
+        self._failures = failures if failures is not None else {}
+        self._elapsed = 0.0
+
+    @property
+    def assets(self) -> List[Asset]:
+        return list(self._assets.values())
+
+    @property
+    def tickers(self) -> List[str]:
+        return list(self._assets.keys())
+
+    @property
+    def failures(self) -> Dict[str, Exception]:
+        return self._failures
+
+    @property
+    def partial(self) -> List[str]:
+        return [ticker for ticker, asset in self._assets.items() if asset.errors]
+
+    @property
+    def elapsed(self) -> float:
+        return self._elapsed
+
+    @property
+    def throughput(self) -> float:
+        if self._elapsed == 0:
+            return 0.0
+
+        return (len(self._assets) + len(self._failures)) / self._elapsed
+
+    @classmethod
+    async def create(
+        cls,
+        session: aiohttp.ClientSession,
+        tickers: Iterable[str],
+        concurrency: Optional[int] = None,
+        progress_interval: Optional[float] = None,
+        lazy: bool = False,
+        start_date: str = "1990-01-01",
+    ) -> Self:
+        self = cls()
+
+        tickers = list(dict.fromkeys(tickers))
+        concurrency = concurrency or get_config_value("universe.concurrency", 16)
+        progress_interval = progress_interval or get_config_value("universe.progress_interval", 5)
+
+        started = time.perf_counter()
+        last_report = started
+
+        if lazy:
+            profiles = {}
+        else:
+            try:
+                profiles = await CompanyProfileData.create_many(session, tickers)
+            except Exception as error:
+                print(f"Failed to prefetch profiles, falling back to per-asset requests: {error}")
+                profiles = {}
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(ticker: str):
+            nonlocal last_report
+
+            async with semaphore:
+                try:
+                    asset = await Asset.create(session, ticker, profile=profiles.get(ticker), lazy=lazy, start_date=start_date)
+                except Exception as error:
+                    self._failures[ticker] = error
+                else:
+                    if asset.errors and not asset.loaded:
+                        self._failures[ticker] = next(iter(asset.errors.values()))
+                    else:
+                        self._assets[ticker] = asset
+
+            now = time.perf_counter()
+            if now - last_report >= progress_interval:
+                last_report = now
+                self._elapsed = now - started
+                self._report_progress(len(tickers))
+
+        await asyncio.gather(*(load(ticker) for ticker in tickers))
+
+        self._elapsed = time.perf_counter() - started
+        self._assets = {ticker: self._assets[ticker] for ticker in tickers if ticker in self._assets}
+        self._report_progress(len(tickers))
+
+        return self
+
+    async def load(self, *names: str, concurrency: Optional[int] = None):
+        concurrency = concurrency or get_config_value("universe.concurrency", 16)
+        names = names or tuple(Asset._components)
+
+        if "profile" in names:
+            missing = [asset.ticker for asset in self if "profile" not in asset.loaded]
+
+            if missing:
+                try:
+                    profiles = await CompanyProfileData.create_many(self._assets[missing[0]].session, missing)
+                except Exception as error:
+                    print(f"Failed to prefetch profiles, falling back to per-asset requests: {error}")
+                    profiles = {}
+
+                for ticker, profile in profiles.items():
+                    self._assets[ticker].attach("profile", profile)
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def load(asset: Asset):
+            async with semaphore:
+                await asset.load(*names)
+
+        await asyncio.gather(*(load(asset) for asset in self))
+
+    def release(self, *names: str):
+        for asset in self:
+            asset.release(*names)
+
+    def _report_progress(self, total: int):
+        done = len(self._assets) + len(self._failures)
+
+        # Assets kept with some failed components are counted separately, they are loaded but incomplete
+        print(
+            f"Loaded {done}/{total} assets ({len(self._failures)} failed, {len(self.partial)} partial) "
+            f"in {self._elapsed:.1f}s, {self.throughput:.2f} assets/s"
+        )
+
+    def get(self, ticker: str, default: Optional[Asset] = None) -> Optional[Asset]:
+        return self._assets.get(ticker, default)
+
+    def filter(self, predicate: Callable[[Asset], bool]) -> Self:
+        assets = {ticker: asset for ticker, asset in self._assets.items() if predicate(asset)}
+
+        return type(self)(assets, dict(self._failures))
+
+    def __getitem__(self, ticker: str) -> Asset:
+        return self._assets[ticker]
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker in self._assets
+
+    def __iter__(self) -> Iterator[Asset]:
+        return iter(self._assets.values())
+
+    def __len__(self) -> int:
+        return len(self._assets)
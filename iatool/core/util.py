@@ -1,17 +1,72 @@
-from typing import Union
+from typing import Dict, Iterable, List, Tuple, Union
 
+import numpy as np
 import pandas as pd
 
+def sort_date_index(data: Union[pd.Series, pd.DataFrame]) -> Union[pd.Series, pd.DataFrame]:
+    if isinstance(data.index, pd.DatetimeIndex) and not data.index.is_monotonic_increasing:
+        return data.sort_index(kind="stable")
+
+    return data
+
+def _date_bounds(index: pd.DatetimeIndex, start_date: pd.Timestamp, end_date: pd.Timestamp) -> slice:
+    return slice(index.searchsorted(start_date, side="left"), index.searchsorted(end_date, side="right"))
+
 def get_date_range(data: Union[pd.Series, pd.DataFrame], start_date: str, end_date: str) -> Union[pd.Series, pd.DataFrame]:
-    if data.empty:
-        return data
+    return get_date_ranges([data], start_date, end_date)[0]
 
-    if not isinstance(data.index, pd.DatetimeIndex):
-        raise ValueError("Data must have a datetime index")
-    
+def get_date_ranges(datas: Iterable[Union[pd.Series, pd.DataFrame]], start_date: str, end_date: str) -> List[Union[pd.Series, pd.DataFrame]]:
     start_date = pd.to_datetime(start_date)
     end_date = pd.to_datetime(end_date)
 
-    filtered_data = data[(data.index >= start_date) & (data.index <= end_date)]
+    # The window is parsed once, and frames sharing an index object are located once; the index is held so its id stays unique
+    bounds: Dict[int, Tuple[pd.DatetimeIndex, slice]] = {}
+    ranges = []
+
+    for data in datas:
+        if data.empty:
+            ranges.append(data)
+            continue
+
+        if not isinstance(data.index, pd.DatetimeIndex):
+            raise ValueError("Data must have a datetime index")
+
+        # Frames are normalised to ascending order when fetched or loaded from the cache, so this is only a monotonicity check
+        data = sort_date_index(data)
+
+        if id(data.index) not in bounds:
+            bounds[id(data.index)] = (data.index, _date_bounds(data.index, start_date, end_date))
+
+        ranges.append(data.iloc[bounds[id(data.index)][1]])
+
+    return ranges
+
+def get_memory_usage(data: Union[pd.Series, pd.DataFrame]) -> int:
+    usage = data.memory_usage(deep=True)
+
+    return int(usage.sum()) if isinstance(usage, pd.Series) else int(usage)
+
+def compact_dtypes(data: pd.DataFrame, category_ratio: float = 0.5, float_rtol: float = 1e-6) -> pd.DataFrame:
+    if data.empty:
+        return data
+
+    compacted = data.copy()
+
+    for column in data.columns:
+        series = data[column]
+
+        if series.dtype == object or pd.api.types.is_string_dtype(series.dtype):
+            if series.nunique(dropna=True) <= category_ratio * len(series):
+                compacted[column] = series.astype("category")
+        elif series.dtype == np.float64:
+            # Integers and whole-number amounts stay at 64 bits, narrower integers overflow silently in later arithmetic
+            values = series.to_numpy()
+            present = values[~np.isnan(values)]
+
+            if present.size and np.any(present != np.round(present)):
+                narrowed = values.astype(np.float32).astype(np.float64)
+
+                if np.allclose(narrowed, values, rtol=float_rtol, atol=0, equal_nan=True):
+                    compacted[column] = series.astype(np.float32)
 
-    return filtered_data
+    return compacted
@@ -1,13 +1,29 @@
+import json
+import random
 import asyncio
-from typing import List
+from typing import Any, Dict, List, Optional
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 
 import aiohttp
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
 
 from ..core.config import Config
+from ..core.config import get_config_value
 from ..core.error import APIError
 from ..core.error import InputError
+from ..core.ratelimit import RateLimiter
+from ..core.singleflight import single_flight
+from ..core.util import compact_dtypes
+from ..core.util import get_memory_usage
+from ..core.util import sort_date_index
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 endpoints = {
     "exchange_tickers": "/symbol/",
@@ -18,6 +34,49 @@ endpoints = {
     "historical_prices": "/historical-price-full/",
 }
 
+def fmp_get_retry_delay(attempt: int, retry_after: Optional[str] = None) -> float:
+    if retry_after is not None:
+        try:
+            return max(0.0, float(retry_after))
+        except ValueError:
+            pass
+
+        try:
+            retry_date = parsedate_to_datetime(retry_after)
+            return max(0.0, (retry_date - datetime.now(retry_date.tzinfo)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+
+    retry_delay = get_config_value("api.fmp.retry_delay", 5)
+    max_retry_delay = get_config_value("api.fmp.max_retry_delay", 60)
+
+    delay = min(max_retry_delay, retry_delay * 2 ** attempt)
+
+    return random.uniform(delay / 2, delay)
+
+def fmp_decode_json(body: bytes) -> Any:
+    decoder = get_config_value("api.fmp.json_decoder", "auto")
+
+    if decoder == "orjson" or (decoder == "auto" and orjson is not None):
+        if orjson is None:
+            raise InputError("JSON decoder 'orjson' is not installed")
+
+        return orjson.loads(body)
+
+    return json.loads(body)
+
+def fmp_compact(df: pd.DataFrame, label: str) -> pd.DataFrame:
+    if not get_config_value("data.compact", False) or df.empty:
+        return df
+
+    before = get_memory_usage(df)
+    df = compact_dtypes(df, float_rtol=get_config_value("data.compact_float_rtol", 1e-6))
+    after = get_memory_usage(df)
+
+    print(f"Compacted {label}: {before} -> {after} bytes, saved {before - after} bytes")
+
+    return df
+
 async def fmp_fetch_data(
     session: aiohttp.ClientSession, 
     url: str, 
@@ -26,6 +85,8 @@ async def fmp_fetch_data(
     config = Config()
     base = config.api.fmp.base
     key = config.api.fmp.key
+    max_retries = get_config_value("api.fmp.max_retries", 5)
+    limiter = RateLimiter()
 
     args_str = "&".join(args)
     full_url = f"{base}{url}?apikey={key}&{args_str}"
@@ -35,22 +96,47 @@ async def fmp_fetch_data(
     else:
         print(f"Fetching data from: {base}{url}")
 
-    while True:
+    for attempt in range(max_retries + 1):
+        await limiter.acquire()
+        body = None
+
         try:
             async with session.get(full_url) as response:
-                if response.status == 429:  # Too many requests
-                    await asyncio.sleep(config.api.retry_delay)
-                response.raise_for_status()
-                return await response.json()
+                if response.status == 429 or response.status >= 500:  # Too many requests or server error
+                    if attempt == max_retries:
+                        response.raise_for_status()
+
+                    delay = fmp_get_retry_delay(attempt, response.headers.get("Retry-After"))
+                    print(f"Retrying in {delay:.1f}s after HTTP {response.status}: {base}{url}")
+
+                    if response.status == 429:
+                        limiter.pause(delay)
+                else:
+                    response.raise_for_status()
+                    body = await response.read()
         except aiohttp.ClientResponseError as http_error:
             raise APIError(f"{http_error}")
-        except aiohttp.ClientConnectionError as conn_error:
-            raise APIError(f"{conn_error}")
-        except aiohttp.ClientPayloadError as payload_error:
-            raise APIError(f"{payload_error}")
+        except (aiohttp.ClientConnectionError, aiohttp.ClientPayloadError, asyncio.TimeoutError) as conn_error:
+            if attempt == max_retries:
+                raise APIError(f"{conn_error}")
+
+            delay = fmp_get_retry_delay(attempt)
+            print(f"Retrying in {delay:.1f}s after {conn_error!r}: {base}{url}")
         except Exception as error:
             raise APIError(f"{error}")
+
+        # With orjson the raw bytes are decoded without the intermediate str that response.json() builds
+        if body is not None:
+            try:
+                return fmp_decode_json(body)
+            except Exception as error:
+                raise APIError(f"{error}")
+
+        await asyncio.sleep(delay)
+
+    raise APIError(f"Retries exhausted: {base}{url}")
         
+@single_flight
 async def fmp_fetch_all_tickers_exchange(
     session: aiohttp.ClientSession,
     exchange: str
@@ -66,13 +152,7 @@ async def fmp_fetch_all_tickers_exchange(
 
     return df
 
-async def fmp_fetch_company_profile(
-    session: aiohttp.ClientSession,
-    ticker: str
-) -> pd.Series:
-    raw_data = await fmp_fetch_data(session, f"{endpoints["profile"]}{ticker}")
-    raw_data = raw_data[0]
-
+def fmp_parse_company_profile(raw_data: dict) -> pd.Series:
     key_mapping = {
         "symbol": "ticker",
         "price": "price",
@@ -120,65 +200,101 @@ async def fmp_fetch_company_profile(
     
     return ds
 
-async def fmp_fetch_historical_prices(
+@single_flight
+async def fmp_fetch_company_profile(
     session: aiohttp.ClientSession,
-    ticker: str,
-    start_date: str = "1990-01-01",
-) -> pd.DataFrame:
-    raw_data = await fmp_fetch_data(session, f"{endpoints['historical_prices']}{ticker}", [f"from={start_date}"])
+    ticker: str
+) -> pd.Series:
+    raw_data = await fmp_fetch_data(session, f"{endpoints["profile"]}{ticker}")
+
+    if not raw_data:
+        raise APIError("No data found")
+
+    return fmp_parse_company_profile(raw_data[0])
+
+@single_flight
+async def fmp_fetch_company_profiles(
+    session: aiohttp.ClientSession,
+    tickers: List[str]
+) -> Dict[str, pd.Series]:
+    batch_size = get_config_value("api.fmp.batch_size", 50)
+    batches = [tickers[i:i + batch_size] for i in range(0, len(tickers), batch_size)]
+
+    async def fetch_batch(batch: List[str]) -> List[dict]:
+        symbols = ",".join(batch)
+
+        return await fmp_fetch_data(session, f"{endpoints["profile"]}{symbols}")
+
+    raw_batches = await asyncio.gather(*(fetch_batch(batch) for batch in batches), return_exceptions=True)
+
+    profiles = {}
+
+    for batch, raw_data in zip(batches, raw_batches):
+        if isinstance(raw_data, BaseException):
+            print(f"Failed to fetch profiles for {len(batch)} tickers: {raw_data}")
+            continue
+
+        for entry in raw_data or []:
+            profiles[entry["symbol"]] = fmp_parse_company_profile(entry)
+
+    return profiles
+
+def fmp_parse_historical_prices(raw_data: dict) -> pd.DataFrame:
+    key_mapping = {
+        "date": "date",
+        "open": "open",
+        "high": "high",
+        "low": "low",
+        "close": "close",
+        "adjClose": "adj_close",
+        "volume": "volume",
+        "unadjustedVolume": "unadjusted_volume",
+        "change": "change",
+        "changePercent": "change_percent",
+        "vwap": "vwap",
+        "label": "label",
+        "changeOverTime": "change_over_time",
+    }
 
     if not raw_data or "historical" not in raw_data:
         return pd.DataFrame()
 
-    dates = []
-    open_prices = []
-    high_prices = []
-    low_prices = []
-    close_prices = []
-    adj_close_prices = []
-    volumes = []
-    unadjusted_volumes = []
-    changes = []
-    change_percent = []
-    vwap = []
-    labels = []
-    change_over_time = []
-
-    for entry in raw_data["historical"]:
-        dates.append(datetime.strptime(entry["date"], "%Y-%m-%d"))
-        open_prices.append(entry["open"])
-        high_prices.append(entry["high"])
-        low_prices.append(entry["low"])
-        close_prices.append(entry["close"])
-        adj_close_prices.append(entry["adjClose"])
-        volumes.append(entry["volume"])
-        unadjusted_volumes.append(entry["unadjustedVolume"])
-        changes.append(entry["change"])
-        change_percent.append(entry["changePercent"])
-        vwap.append(entry["vwap"])
-        labels.append(entry["label"])
-        change_over_time.append(entry["changeOverTime"])
-
-    df = pd.DataFrame({
-        "date": pd.to_datetime(dates),
-        "open": open_prices,
-        "high": high_prices,
-        "low": low_prices,
-        "close": close_prices,
-        "adj_close": adj_close_prices,
-        "volume": volumes,
-        "unadjusted_volume": unadjusted_volumes,
-        "change": changes,
-        "change_percent": change_percent,
-        "vwap": vwap,
-        "label": labels,
-        "change_over_time": change_over_time
-    })
+    historical = raw_data["historical"]
+    text_keys = ["date", "label"]
+    columns = {}
+
+    # Each field is converted column-wise through Arrow, every column is kept even when some or all rows lack its key
+    for key, column in key_mapping.items():
+        array = pa.array([entry.get(key) for entry in historical])
+
+        if array.type == pa.null():
+            array = array.cast(pa.string() if key in text_keys else pa.float64())
+
+        columns[column] = array
+
+    try:
+        columns["date"] = pc.strptime(columns["date"], format="%Y-%m-%d", unit="ns")
+    except pa.ArrowInvalid as error:
+        raise APIError(f"{error}")
 
+    df = pa.table(columns).to_pandas()
     df.set_index("date", inplace=True)
 
     return df
 
+@single_flight
+async def fmp_fetch_historical_prices(
+    session: aiohttp.ClientSession,
+    ticker: str,
+    start_date: str = "1990-01-01",
+) -> pd.DataFrame:
+    raw_data = await fmp_fetch_data(session, f"{endpoints['historical_prices']}{ticker}", [f"from={start_date}"])
+
+    df = sort_date_index(fmp_parse_historical_prices(raw_data))
+
+    return fmp_compact(df, f"historical prices for {ticker}")
+
+@single_flight
 async def fmp_fetch_income_statement(
     session: aiohttp.ClientSession, 
     ticker: str, 
@@ -236,9 +352,13 @@ async def fmp_fetch_income_statement(
     df.rename(columns=key_mapping, inplace=True)
     df["date"] = pd.to_datetime(df["date"])
     df.set_index("date", inplace=True)
+    df = sort_date_index(df)
+
+    df = fmp_compact(df, f"{period} income statement for {ticker}")
 
     return df
 
+@single_flight
 async def fmp_fetch_balance_sheet(
     session: aiohttp.ClientSession, 
     ticker: str,
@@ -313,9 +433,13 @@ async def fmp_fetch_balance_sheet(
     df.rename(columns=key_mapping, inplace=True)
     df["date"] = pd.to_datetime(df["date"])
     df.set_index("date", inplace=True)
+    df = sort_date_index(df)
+
+    df = fmp_compact(df, f"{period} balance sheet for {ticker}")
 
     return df
 
+@single_flight
 async def fmp_fetch_cash_flow(
     session: aiohttp.ClientSession, 
     ticker: str,
@@ -376,5 +500,8 @@ async def fmp_fetch_cash_flow(
     df.rename(columns=key_mapping, inplace=True)
     df["date"] = pd.to_datetime(df["date"])
     df.set_index("date", inplace=True)
+    df = sort_date_index(df)
+
+    df = fmp_compact(df, f"{period} cash flow for {ticker}")
 
     return df
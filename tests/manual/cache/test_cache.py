@@ -13,8 +13,8 @@ test_data = pd.DataFrame({
 })
 
 # Filepaths
-test_file = "test_data.feather"
-expired_file = "expired_data.feather"
+test_file = "test_data.parquet"
+expired_file = "expired_data.parquet"
 
 # 1. Test `set` method
 expiry_date = datetime.now() + timedelta(days=1)  # Set expiry for tomorrow
@@ -34,16 +34,26 @@ assert expired_retrieved is None, "Expired data should return None."
 print("Test `get` method passed for expired cache.")
 
 # 4. Test missing file handling
-missing_retrieved = cache.get("nonexistent_file.feather")
+missing_retrieved = cache.get("nonexistent_file.parquet")
 assert missing_retrieved is None, "Nonexistent file should return None."
 print("Test `get` method passed for nonexistent file.")
 
-# 5. Test metadata persistence
-import json
-with open("test_cache/metadata.json", "r") as meta_file:
-    metadata = json.load(meta_file)
-assert metadata["expiries"][test_file] == expiry_date.strftime("%Y-%m-%d"), "Metadata not updated correctly."
-print("Metadata persistence test passed.")
+# 5. Test catalog persistence
+import sqlite3
+cache.flush()
+with sqlite3.connect("test_cache/catalog.sqlite") as connection:
+    (expiry,) = connection.execute("SELECT expiry FROM entries WHERE filepath = ?", (test_file,)).fetchone()
+assert expiry == expiry_date.strftime("%Y-%m-%d"), "Catalog not updated correctly."
+assert cache.expiry(test_file).strftime("%Y-%m-%d") == expiry, "In-memory catalog out of sync."
+print("Catalog persistence test passed.")
+
+# 6. Test compaction of orphaned files
+with open("test_cache/orphan.parquet", "w") as orphan_file:
+    orphan_file.write("orphan")
+reclaimed = cache.compact()
+assert reclaimed >= len("orphan"), "Orphaned file was not reclaimed."
+assert cache.get(test_file) is not None, "Live entry should survive compaction."
+print("Compaction test passed.")
 
 # Cleanup (optional)
 import shutil
@@ -4,4 +4,4 @@ config = Config()
 
 print(config.api.fmp.base_url)
 print(config.api.fmp.key)
-print(config.api.retry_delay)
+print(config.api.fmp.retry_delay)
@@ -0,0 +1,113 @@
+import timeit
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from iatool.data.fmp import fmp_parse_historical_prices
+
+def make_raw_data(num_rows: int) -> dict:
+    start = datetime(1990, 1, 1)
+    historical = []
+
+    for i in range(num_rows):
+        price = 100.0 + i * 0.01
+        date = start + timedelta(days=i)
+
+        historical.append({
+            "date": date.strftime("%Y-%m-%d"),
+            "open": price,
+            "high": price + 1,
+            "low": price - 1,
+            "close": price + 0.5,
+            "adjClose": price + 0.4,
+            "volume": 1000000 + i,
+            "unadjustedVolume": 1000000 + i,
+            "change": 0.5,
+            "changePercent": 0.5,
+            "vwap": price + 0.2,
+            "label": date.strftime("%B %d, %y"),
+            "changeOverTime": 0.005,
+        })
+
+    return {"symbol": "TEST", "historical": historical[::-1]}
+
+def parse_loop(raw_data: dict) -> pd.DataFrame:
+    dates = []
+    open_prices = []
+    high_prices = []
+    low_prices = []
+    close_prices = []
+    adj_close_prices = []
+    volumes = []
+    unadjusted_volumes = []
+    changes = []
+    change_percent = []
+    vwap = []
+    labels = []
+    change_over_time = []
+
+    for entry in raw_data["historical"]:
+        dates.append(datetime.strptime(entry["date"], "%Y-%m-%d"))
+        open_prices.append(entry["open"])
+        high_prices.append(entry["high"])
+        low_prices.append(entry["low"])
+        close_prices.append(entry["close"])
+        adj_close_prices.append(entry["adjClose"])
+        volumes.append(entry["volume"])
+        unadjusted_volumes.append(entry["unadjustedVolume"])
+        changes.append(entry["change"])
+        change_percent.append(entry["changePercent"])
+        vwap.append(entry["vwap"])
+        labels.append(entry["label"])
+        change_over_time.append(entry["changeOverTime"])
+
+    df = pd.DataFrame({
+        "date": pd.to_datetime(dates),
+        "open": open_prices,
+        "high": high_prices,
+        "low": low_prices,
+        "close": close_prices,
+        "adj_close": adj_close_prices,
+        "volume": volumes,
+        "unadjusted_volume": unadjusted_volumes,
+        "change": changes,
+        "change_percent": change_percent,
+        "vwap": vwap,
+        "label": labels,
+        "change_over_time": change_over_time
+    })
+
+    df.set_index("date", inplace=True)
+
+    return df
+
+def main():
+    num_rows = 10000
+    repeats = 20
+
+    raw_data = make_raw_data(num_rows)
+
+    pd.testing.assert_frame_equal(parse_loop(raw_data), fmp_parse_historical_prices(raw_data))
+
+    # An empty history keeps the columns and the date index
+    empty = fmp_parse_historical_prices({"symbol": "TEST", "historical": []})
+    pd.testing.assert_index_equal(empty.columns, parse_loop(raw_data).columns)
+    assert empty.empty and isinstance(empty.index, pd.DatetimeIndex)
+
+    # A key missing from the newest row is missing for that row only
+    partial_data = make_raw_data(100)
+    expected_data = make_raw_data(100)
+    del partial_data["historical"][0]["label"]
+    expected_data["historical"][0]["label"] = None
+
+    pd.testing.assert_frame_equal(parse_loop(expected_data), fmp_parse_historical_prices(partial_data))
+
+    loop_time = min(timeit.repeat(lambda: parse_loop(raw_data), number=1, repeat=repeats))
+    vectorized_time = min(timeit.repeat(lambda: fmp_parse_historical_prices(raw_data), number=1, repeat=repeats))
+
+    print(f"Row-by-row parse: {loop_time * 1000:.2f} ms per {num_rows} rows")
+    print(f"Vectorized parse: {vectorized_time * 1000:.2f} ms per {num_rows} rows")
+    print(f"Speedup: {loop_time / vectorized_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import os
+import json
+import asyncio
+import resource
+import tempfile
+import tracemalloc
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import aiohttp
+import pandas as pd
+
+from iatool.core.config import Config
+from iatool.data.fmp import endpoints
+from iatool.data.fmp import fmp_parse_historical_prices
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def build_frame(name: str, raw_data) -> pd.DataFrame:
+    if name == "historical_prices":
+        return fmp_parse_historical_prices(raw_data)
+
+    if name == "exchange_tickers":
+        return pd.Series([item["symbol"] for item in raw_data])
+
+    return pd.DataFrame(raw_data)
+
+def measure(name: str, path: str, decoder: str) -> dict:
+    with open(path, "rb") as file:
+        body = file.read()
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    tracemalloc.start()
+
+    if decoder == "response.json":
+        raw_data = json.loads(body.decode("utf-8"))
+    elif decoder == "orjson":
+        raw_data = orjson.loads(body)
+    else:
+        raw_data = json.loads(body)
+
+    frame = build_frame(name, raw_data)
+    del raw_data
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    size = frame.memory_usage(deep=True)
+    size = int(size.sum()) if isinstance(size, pd.Series) else int(size)
+
+    return {
+        "endpoint": name,
+        "decoder": decoder,
+        "body_kb": len(body) // 1024,
+        "frame_kb": size // 1024,
+        "traced_peak_kb": peak // 1024,
+        "peak_rss_delta_kb": rss_after - rss_before,
+    }
+
+async def download(session: aiohttp.ClientSession, url: str, args: str = "") -> bytes:
+    config = Config()
+
+    async with session.get(f"{config.api.fmp.base}{url}?apikey={config.api.fmp.key}&{args}") as response:
+        response.raise_for_status()
+        return await response.read()
+
+async def main():
+    ticker = "AAPL"
+    requests = {
+        "historical_prices": (f"{endpoints['historical_prices']}{ticker}", "from=1990-01-01"),
+        "exchange_tickers": (f"{endpoints['exchange_tickers']}NASDAQ", ""),
+        "income_statement": (f"{endpoints['income_statement']}{ticker}", "period=quarter"),
+    }
+
+    decoders = ["response.json", "json"] + (["orjson"] if orjson is not None else [])
+
+    with tempfile.TemporaryDirectory() as dirname:
+        paths = {}
+
+        async with aiohttp.ClientSession() as session:
+            for name, (url, args) in requests.items():
+                paths[name] = os.path.join(dirname, f"{name}.json")
+
+                with open(paths[name], "wb") as file:
+                    file.write(await download(session, url, args))
+
+        results = []
+
+        # Each measurement runs in a fresh process so that peak RSS is not shared between runs
+        for name, path in paths.items():
+            for decoder in decoders:
+                with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+                    results.append(executor.submit(measure, name, path, decoder).result())
+
+    print(pd.DataFrame(results).to_string(index=False))
+
+if __name__ == "__main__":
+    asyncio.run(main())
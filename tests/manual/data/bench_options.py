@@ -0,0 +1,64 @@
+import math
+import timeit
+
+import numpy as np
+
+from iatool.core.options import binomial_american
+from iatool.core.options import black_scholes
+from iatool.core.options import black_scholes_greeks
+from iatool.core.options import implied_volatility
+from iatool.core.options import norm_cdf
+
+def make_chain(num_tickers: int, strikes_per_expiry: int, num_expiries: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+
+    spot = np.repeat(rng.uniform(5, 500, num_tickers), strikes_per_expiry * num_expiries * 2)
+    count = len(spot)
+
+    moneyness = np.tile(np.linspace(0.7, 1.3, strikes_per_expiry), num_tickers * num_expiries * 2)
+    expiries = np.tile(np.repeat(np.linspace(0.05, 2, num_expiries), strikes_per_expiry * 2), num_tickers)
+
+    return {
+        "spot": spot,
+        "strike": spot * moneyness,
+        "time": expiries,
+        "rate": np.full(count, 0.04),
+        "volatility": rng.uniform(0.1, 0.8, count),
+        "call": np.tile(np.repeat([True, False], strikes_per_expiry), num_tickers * num_expiries),
+        "dividend_yield": rng.uniform(0, 0.03, count),
+    }
+
+def main():
+    chain = make_chain(num_tickers=2000, strikes_per_expiry=25, num_expiries=4)
+    count = len(chain["spot"])
+    repeats = 5
+
+    x = np.linspace(-10, 10, 200001)
+    reference = np.array([0.5 * math.erfc(-value / math.sqrt(2)) for value in x])
+    print(f"Normal CDF max absolute error against math.erfc: {np.max(np.abs(norm_cdf(x) - reference)):.2e}")
+
+    prices = black_scholes(**chain)
+
+    price_time = min(timeit.repeat(lambda: black_scholes(**chain), number=1, repeat=repeats))
+    greeks_time = min(timeit.repeat(lambda: black_scholes_greeks(**chain), number=1, repeat=repeats))
+
+    arguments = {key: value for key, value in chain.items() if key != "volatility"}
+    iv_time = min(timeit.repeat(lambda: implied_volatility(prices, **arguments), number=1, repeat=repeats))
+
+    implied = implied_volatility(prices, **arguments)
+    solved = np.isfinite(implied)
+    repriced = black_scholes(**{**chain, "volatility": np.where(solved, implied, chain["volatility"])})
+
+    print(f"Black-Scholes prices: {price_time * 1000:.1f} ms per {count} options")
+    print(f"Black-Scholes Greeks: {greeks_time * 1000:.1f} ms per {count} options")
+    print(f"Implied volatility: {iv_time * 1000:.1f} ms per {count} quotes, {solved.mean():.2%} solved")
+    print(f"Max repricing error: {np.max(np.abs(repriced - prices)):.2e}")
+
+    subset = {key: value[:10000] for key, value in chain.items()}
+    tree_time = min(timeit.repeat(lambda: binomial_american(**subset, steps=200), number=1, repeat=2))
+    print(f"American binomial tree: {tree_time * 1000:.1f} ms per 10000 options with 200 steps")
+
+    print(f"{binomial_american(100, 100, 1, 0.05, 0.2, call=False, steps=2000):.4f} (American put, about 6.090)")
+
+if __name__ == "__main__":
+    main()
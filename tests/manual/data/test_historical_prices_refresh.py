@@ -0,0 +1,94 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+import iatool.core.data as data_module
+from iatool.core.data import HistoricalPricesData
+
+class MemoryCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, key: str, allow_expired: bool = False):
+        return self.entries.get(key)
+
+    def set(self, key: str, value, expiry: datetime):
+        self.entries[key] = value
+
+def make_history(num_rows: int, adjustment: float = 0.99) -> pd.DataFrame:
+    dates = pd.bdate_range("2020-01-01", periods=num_rows, name="date")
+    close = 100.0 + np.sin(np.arange(num_rows) / 10) * 5
+
+    return pd.DataFrame({
+        "open": close - 0.5,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "adj_close": close * adjustment,
+        "volume": np.arange(num_rows) + 1000000,
+        "change_over_time": close / close[0] - 1,
+    }, index=dates)
+
+class StubFetcher:
+    def __init__(self, history: pd.DataFrame):
+        self.history = history
+        self.calls = []
+
+    async def __call__(self, session, ticker: str, start_date: str = "1990-01-01") -> pd.DataFrame:
+        self.calls.append(start_date)
+
+        # Like FMP, change_over_time is relative to the first bar of the requested range
+        window = self.history[self.history.index >= pd.to_datetime(start_date)].copy()
+        window["change_over_time"] = window["close"] / window["close"].iloc[0] - 1
+
+        return window
+
+def check_frames(actual: pd.DataFrame, expected: pd.DataFrame):
+    # Compact mode may narrow the merged frame to float32
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False, rtol=1e-5)
+
+async def refresh(cached: pd.DataFrame, fetcher: StubFetcher) -> HistoricalPricesData:
+    data_module.fmp_fetch_historical_prices = fetcher
+
+    data = HistoricalPricesData(None, "TEST", "2020-01-01")
+    data._data = cached
+    await data.update()
+
+    return data
+
+async def main():
+    HistoricalPricesData._cache = MemoryCache()
+    full = make_history(500)
+
+    # A plain refresh fetches only the bars after the overlap and appends them
+    fetcher = StubFetcher(full)
+    data = await refresh(full.iloc[:-20], fetcher)
+
+    assert len(fetcher.calls) == 1 and fetcher.calls[0] > "2020-01-01"
+    check_frames(data.data, full)
+    print(f"Delta append: fetched from {fetcher.calls[0]}, {len(data.data)} bars")
+
+    # A dividend rescales adj_close over the whole history, so the full history is downloaded again
+    restated = make_history(500, adjustment=0.97)
+    fetcher = StubFetcher(restated)
+    data = await refresh(full.iloc[:-20], fetcher)
+
+    assert len(fetcher.calls) == 2 and fetcher.calls[1] == "2020-01-01"
+    check_frames(data.data, restated)
+    print(f"Restated overlap: fetched from {fetcher.calls[0]}, then the full history")
+
+    # A restated close in the overlap without a new adjustment factor is merged in place
+    corrected = full.copy()
+    corrected.iloc[-25, corrected.columns.get_loc("close")] += 1
+    corrected.iloc[-25, corrected.columns.get_loc("adj_close")] = corrected["close"].iloc[-25] * 0.99
+    fetcher = StubFetcher(corrected)
+    data = await refresh(full.iloc[:-20], fetcher)
+
+    assert len(fetcher.calls) == 1
+    check_frames(data.data.drop(columns="change_over_time"), corrected.drop(columns="change_over_time"))
+    print("Corrected bar in the overlap: merged without a full download")
+
+if __name__ == "__main__":
+    asyncio.run(main())
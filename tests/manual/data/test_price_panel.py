@@ -0,0 +1,29 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.panel import PricePanel
+from iatool.core.search import SearchTool
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[100:110]
+
+        universe = await Universe.create(session, asx_tickers)
+
+        PricePanel.from_assets(universe)
+
+        panel = PricePanel()
+        print(panel.fields)
+        print(panel.tickers)
+        print()
+        print(panel.get("adj_close", "2023-01-01", "2023-12-31"))
+        print()
+        print(panel.get("volume", "2023-06-01", "2023-06-30", panel.tickers[:3]))
+
+if __name__ == "__main__":
+    asyncio.run(main())
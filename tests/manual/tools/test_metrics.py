@@ -0,0 +1,32 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.metrics import Metrics
+from iatool.core.search import SearchTool
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[:20]
+
+        universe = await Universe.create(session, asx_tickers, concurrency=8)
+
+        metrics = Metrics(universe, "quarter")
+
+        print(metrics.panel("income_statement"))
+        print(metrics.ttm("income_statement", "revenue"))
+        print(metrics.growth("income_statement", "revenue", ttm=True))
+        print(metrics.summary())
+
+        # Served from the memo until a statement is refreshed
+        print(metrics.roe() is metrics.roe())
+
+        await universe.assets[0].update()
+        print(metrics.roe() is metrics.roe())
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,33 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.montecarlo import MonteCarlo
+from iatool.core.search import SearchTool
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[:30]
+
+        universe = await Universe.create(session, asx_tickers, concurrency=8)
+
+        gbm = MonteCarlo.from_assets(universe, "2015-01-01", "2100-01-01", horizon=252)
+        result = gbm.run(paths=20000, processes=2, seed=42)
+        print(result.summary())
+
+        # Same seed with a different number of processes gives the same paths
+        serial = gbm.run(paths=20000, seed=42)
+        print(f"Reproducible: {(serial.terminal_wealth == result.terminal_wealth).all()}")
+
+        early = gbm.run(paths=200000, tolerance=0.01, seed=42)
+        print(f"Converged: {early.converged} after {early.paths} paths")
+
+        bootstrap = MonteCarlo.from_assets(universe, "2015-01-01", "2100-01-01", method="bootstrap", block_size=5)
+        print(bootstrap.run(paths=10000, seed=42).summary())
+
+if __name__ == "__main__":
+    asyncio.run(main())
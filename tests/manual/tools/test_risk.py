@@ -0,0 +1,41 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.risk import get_correlation
+from iatool.core.risk import get_covariance
+from iatool.core.risk import get_price_matrix
+from iatool.core.risk import get_returns
+from iatool.core.risk import get_rolling_beta
+from iatool.core.risk import get_shrunk_covariance
+from iatool.core.risk import get_value_at_risk
+from iatool.core.search import SearchTool
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[:30]
+
+        universe = await Universe.create(session, asx_tickers, concurrency=8)
+
+        prices = get_price_matrix(universe, "2015-01-01", "2100-01-01")
+        returns = get_returns(prices)
+
+        print(get_covariance(returns, min_periods=60, dtype="float32"))
+
+        covariance, shrinkage = get_shrunk_covariance(returns, min_periods=60)
+        print(f"Shrinkage intensity: {shrinkage:.3f}")
+        print(get_correlation(covariance))
+
+        # The equal-weighted average of the universe stands in for an index
+        benchmark = returns.mean(axis=1)
+        print(get_rolling_beta(returns, benchmark, window=252).tail())
+
+        print(get_value_at_risk(returns, 0.99))
+        print(get_value_at_risk(returns, 0.99, method="parametric"))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -3,8 +3,10 @@ import asyncio
 import aiohttp
 
 from iatool.core.asset import Asset
+from iatool.core.features import FeatureTable
 from iatool.core.search import SearchTool
-from iatool.core.screen import ScreenTool
+from iatool.core.screen import Screen, ScreenTool
+from iatool.core.universe import Universe
 
 def pred(asset: Asset) -> bool:
     income_statement = asset.get_income_statement("2020-01-01", "2021-01-01", "quarter")
@@ -25,25 +27,75 @@ def pred(asset: Asset) -> bool:
         print(f"Found one with revenue less than or equal to {revenue_threshold}")
         return False
 
+def branching_pred(asset: Asset) -> bool:
+    if asset.get_profile()["sector"] != "Technology":
+        return False
+
+    income_statement = asset.get_income_statement("2020-01-01", "2021-01-01", "quarter")
+
+    return not income_statement.empty and income_statement["revenue"].mean() > 100000
+
 async def main():
     async with aiohttp.ClientSession() as session:
         search = SearchTool(session)
 
         asx_tickers = await search.get_all_tickers_exchange("ASX")
         asx_tickers = asx_tickers[100:105]
-        
-        assets = []
 
-        for ticker in asx_tickers:
-            asset = await Asset.create(session, ticker)
-            
-            assets.append(asset)
+        universe = await Universe.create(session, asx_tickers)
 
         screen = ScreenTool()
-        results = screen.run(assets, pred)
+        results = screen.run(universe.assets, pred)
 
         for asset in results:
             print(asset.ticker)
 
+        table = (
+            FeatureTable(universe)
+            .add_statement("income_statement", "revenue", "quarter", "2020-01-01", "2021-01-01", "mean", name="revenue")
+            .add_profile("market_cap")
+            .add_profile("beta")
+            .build()
+        )
+        print(table)
+
+        results = screen.run(universe.assets, "revenue > 100000", table)
+
+        for asset in results:
+            print(asset.ticker)
+
+        # Only the quarterly income statements are fetched, and only for tickers passing the profile filter
+        pushdown = Screen(pred, profile_filter="market_cap > 100000000")
+        print(pushdown.requires)
+
+        results = await screen.screen(session, asx_tickers, pushdown)
+
+        for asset in results:
+            print(asset.ticker, asset.loaded)
+
+        # The same screen with the predicate run in a process pool
+        results = await screen.screen(session, asx_tickers, pushdown, processes=2)
+
+        for asset in results:
+            print(f"Parallel match: {asset.ticker}")
+
+        print(screen.errors)
+
+        async for asset in screen.stream(session, asx_tickers, pushdown):
+            print(f"Streamed match: {asset.ticker}")
+
+        print(screen.errors)
+
+        # The profile lookup fails on an empty profile, so the income statement is only loaded once reached
+        branching = Screen(branching_pred)
+        print(branching.requires)
+
+        results = await screen.screen(session, asx_tickers, branching)
+
+        for asset in results:
+            print(asset.ticker, asset.loaded)
+
+        print(screen.errors)
+
 if __name__ == "__main__":
     asyncio.run(main())
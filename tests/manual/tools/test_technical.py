@@ -0,0 +1,39 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.panel import PricePanel
+from iatool.core.search import SearchTool
+from iatool.core.technical import ATR, EMA, MACD, RSI, SMA, BollingerBands, Volatility
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[:20]
+
+        universe = await Universe.create(session, asx_tickers, concurrency=8)
+
+        panel = PricePanel.from_assets(universe)
+
+        close = panel.get("adj_close", "2000-01-01", "2100-01-01")
+        high = panel.get("high", "2000-01-01", "2100-01-01")
+        low = panel.get("low", "2000-01-01", "2100-01-01")
+
+        print(SMA.compute(close, window=50).tail())
+        print(EMA.compute(close, span=20).tail())
+        print(RSI.compute(close).tail())
+        print(MACD.compute(close)["histogram"].tail())
+        print(BollingerBands.compute(close)["upper"].tail())
+        print(ATR.compute(high, low, close).tail())
+        print(Volatility.compute(close).tail())
+
+        # Advancing the state with the last bars gives the same values as a full recomputation
+        rsi = RSI()
+        rsi.update(close.iloc[:-5])
+        print((rsi.update(close.iloc[-5:]) - RSI.compute(close).iloc[-5:]).abs().max().max())
+
+if __name__ == "__main__":
+    asyncio.run(main())
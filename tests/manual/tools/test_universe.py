@@ -0,0 +1,27 @@
+import asyncio
+
+import aiohttp
+
+from iatool.core.search import SearchTool
+from iatool.core.universe import Universe
+
+async def main():
+    async with aiohttp.ClientSession() as session:
+        search = SearchTool(session)
+
+        asx_tickers = await search.get_all_tickers_exchange("ASX")
+        asx_tickers = asx_tickers[:50]
+
+        universe = await Universe.create(session, asx_tickers, concurrency=8)
+
+        print(f"Loaded {len(universe)} assets at {universe.throughput:.2f} assets/s")
+
+        for ticker, error in universe.failures.items():
+            print(f"{ticker}: {error}")
+
+        ticker = universe.tickers[0]
+        print(ticker in universe)
+        print(universe[ticker].get_profile())
+
+if __name__ == "__main__":
+    asyncio.run(main())